@@ -1,8 +1,20 @@
+import atexit
+import copy
 import json
 import os
+import threading
 
 SETTINGS_FILE = "settings.json"
 
+# Debounce interval for save_settings. The GUI saves on every spinbox tick
+# and slider change, so rapid edits are coalesced into a single disk write.
+SAVE_DEBOUNCE_SECONDS = 0.5
+
+# Cache for load_settings, keyed on the settings file's mtime so repeated
+# calls (the GUI reloads settings from several places) skip disk I/O and
+# JSON parsing when the file hasn't changed.
+_load_cache = {"mtime": None, "data": None}
+
 # Define default global settings
 DEFAULT_SETTINGS = {
     "firmware": "klipper",
@@ -13,11 +25,39 @@ DEFAULT_SETTINGS = {
     "z_hop_height": 0.2
 }
 
+def deep_merge(dst, src):
+    """
+    Recursively merges src into dst in place. Nested dicts (script-specific
+    settings) are merged key-by-key instead of being replaced wholesale,
+    so defaults added in future versions survive alongside saved values.
+    """
+    for key, value in src.items():
+        if isinstance(value, dict) and isinstance(dst.get(key), dict):
+            deep_merge(dst[key], value)
+        else:
+            dst[key] = value
+    return dst
+
+
 def load_settings():
     """
     Loads settings from settings.json. If the file doesn't exist,
     returns default settings. Merges new default settings if available.
+    The parsed result is cached against the file's mtime, so repeated calls
+    only re-read the file when it has actually changed on disk.
     """
+    # Check the cache first: if the file's mtime is unchanged, return a copy
+    # of the previously merged result without touching the disk again.
+    try:
+        current_mtime = os.stat(SETTINGS_FILE).st_mtime_ns
+    except FileNotFoundError:
+        current_mtime = None
+
+    if current_mtime is not None and current_mtime == _load_cache["mtime"]:
+        # Return a deep copy so callers can mutate their settings dict
+        # without corrupting the cached version.
+        return copy.deepcopy(_load_cache["data"])
+
     settings = {}
     if os.path.exists(SETTINGS_FILE):
         try:
@@ -28,42 +68,86 @@ def load_settings():
             settings = {} # Reset to empty dict if file is corrupt
     
     # Merge with default settings to ensure all keys are present
-    # This also handles new default settings being added in future versions
-    # and ensures that only global settings are picked from DEFAULT_SETTINGS
-    
-    # Start with global defaults
-    merged_settings = DEFAULT_SETTINGS.copy()
-    
-    # Overwrite with saved settings for global keys
-    for key, value in settings.items():
-        if key in DEFAULT_SETTINGS:
-            merged_settings[key] = value
-        else: # Keep script-specific settings as nested dicts
-            merged_settings[key] = value # This will carry over the nested script settings
-
-    # Ensure nested script-specific settings are also merged, not just overwritten
-    # Iterate through potentially saved script settings and merge them
-    for script_name, script_settings in settings.items():
-        if script_name not in DEFAULT_SETTINGS and isinstance(script_settings, dict):
-            if script_name not in merged_settings:
-                merged_settings[script_name] = {}
-            # Merge individual script settings (don't overwrite the whole dict)
-            for setting_key, setting_value in script_settings.items():
-                merged_settings[script_name][setting_key] = setting_value
+    # This also handles new default settings being added in future versions.
+    # A single recursive pass replaces the previous two loops (one for global
+    # keys, one for nested script dicts) and merges nested dicts properly
+    # instead of first copying them by reference and then clobbering them.
+    merged_settings = deep_merge(copy.deepcopy(DEFAULT_SETTINGS), settings)
+
+    # Store the merged result in the cache for subsequent calls
+    _load_cache["mtime"] = current_mtime
+    _load_cache["data"] = copy.deepcopy(merged_settings)
 
     return merged_settings
 
 
+def _clear_load_cache():
+    """
+    Clears the load_settings cache, forcing the next call to re-read the
+    settings file from disk. Mirrors functools.lru_cache's cache_clear().
+    """
+    _load_cache["mtime"] = None
+    _load_cache["data"] = None
+
+load_settings.cache_clear = _clear_load_cache
+
+
+# State for the debounced save: the most recent settings snapshot and the
+# timer that will flush it. Guarded by a lock since timers fire on their
+# own thread.
+_save_lock = threading.Lock()
+_pending_settings = None
+_save_timer = None
+
+
 def save_settings(settings):
     """
     Saves the current settings to settings.json.
+    Rapid successive calls are debounced: only a snapshot of the latest
+    settings is written, after SAVE_DEBOUNCE_SECONDS of quiet. The write
+    itself goes through a temp file + os.replace so a crash mid-write can
+    never leave a truncated settings.json behind.
     """
+    global _pending_settings, _save_timer
+    with _save_lock:
+        _pending_settings = copy.deepcopy(settings)
+        if _save_timer is not None:
+            _save_timer.cancel()
+        _save_timer = threading.Timer(SAVE_DEBOUNCE_SECONDS, flush_settings)
+        _save_timer.daemon = True
+        _save_timer.start()
+
+
+def flush_settings():
+    """
+    Immediately writes any pending settings to disk (atomically).
+    Called by the debounce timer and registered with atexit so a pending
+    save is never lost on shutdown.
+    """
+    global _pending_settings, _save_timer
+    with _save_lock:
+        settings = _pending_settings
+        _pending_settings = None
+        if _save_timer is not None:
+            _save_timer.cancel()
+            _save_timer = None
+
+    if settings is None:
+        return
+
+    tmp_path = SETTINGS_FILE + ".tmp"
     try:
-        with open(SETTINGS_FILE, "w") as f:
+        with open(tmp_path, "w") as f:
             json.dump(settings, f, indent=4)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, SETTINGS_FILE)
     except Exception as e:
         print(f"Error saving settings to {SETTINGS_FILE}: {e}")
 
+
+atexit.register(flush_settings)
+
 if __name__ == "__main__":
     # Example usage:
     # On first run or if settings.json is missing/corrupt, it will load defaults.
@@ -1,14 +1,85 @@
+import ctypes
 import sys
+import numpy as np
 from PyQt5.QtWidgets import QWidget, QApplication, QMenu
-from PyQt5.QtGui import QPainter, QColor, QPen, QFont, QTransform
-from PyQt5.QtCore import Qt, QRectF, QPointF # Corrected: QPointF imported from QtCore
+from PyQt5.QtGui import QPainter, QColor, QPen, QFont, QTransform, QPolygonF, QPicture
+from PyQt5.QtCore import Qt, QRectF, QPointF, QTimer # Corrected: QPointF imported from QtCore
+
+
+def _polygon_from_xy(xy):
+    """
+    Builds a QPolygonF from an (N, 2) array of x, y coordinates by copying
+    the raw doubles straight into the polygon's internal QPointF buffer.
+    This avoids allocating one Python QPointF per vertex, so construction
+    cost is essentially one memcpy.
+    """
+    n = len(xy)
+    poly = QPolygonF(n)
+    if n:
+        try:
+            ptr = int(poly.data()) # sip.voidptr to the QPointF array
+        except AttributeError:
+            # Older PyQt without QVector.data(); fall back to per-point build.
+            return QPolygonF([QPointF(float(x), float(y)) for x, y in xy])
+        buf = np.ascontiguousarray(xy, dtype=np.float64)
+        ctypes.memmove(ptr, buf.ctypes.data, buf.nbytes)
+    return poly
 
 class GCodeViewer(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
-        self.gcode_data = []  # Stores list of (QPointF(x, y), z_value) for toolpath
+        # paintEvent fills the whole rect itself, so tell Qt not to clear
+        # the backing store first.
+        self.setAttribute(Qt.WA_OpaquePaintEvent)
+        # Toolpath stored as a contiguous (N, 3) float32 array of x, y, z
+        # columns — 12 bytes/point instead of a Python tuple + QPointF +
+        # float per point, and amenable to vectorized processing.
+        self._xyz = np.empty((0, 3), dtype=np.float32)
+        # Cached toolpath bounding box as (min_xyz, max_xyz) arrays,
+        # computed once per data load so fit_to_view never rescans the path.
+        self._bbox = None
         self.layer_start_points = [] # Stores (QPointF(x,y), z_value) for initial layer moves
-        self.processed_snapshot_points = [] # Stores (QPointF(x,y), z_value) for script-inserted snapshots
+        # Script-inserted snapshot positions as an (N, 3) float32 array of
+        # x, y, z rows (same SoA layout as the toolpath).
+        self._snap_xyz = np.empty((0, 3), dtype=np.float32)
+
+        # Cached polylines of the toolpath (one per view mode), built
+        # lazily the first time each view is actually painted and drawn
+        # with a single drawPolyline call. Lazy construction halves the
+        # load-time stall since only one view is visible at a time.
+        # The polylines are decimated to the current zoom (sub-pixel
+        # segments dropped); _decimation_scale records the scale they were
+        # built for so they are rebuilt once zoom drifts far enough.
+        self._toolpath_polyline_top = None
+        self._toolpath_polyline_front = None
+        self._decimation_scale = None
+
+        # Composed world-to-device transform, cached against the pan/zoom
+        # and view state so unchanged repaints skip recomposing the matrix.
+        self._xform = QTransform()
+        self._xform_key = None
+
+        # Per-view display points for the marker overlays, precomputed in
+        # the setters so paintEvent neither branches on view_mode per point
+        # nor allocates QPointFs per repaint.
+        self._layer_start_display_top = QPolygonF()
+        self._layer_start_display_front = QPolygonF()
+        self._snapshot_display_top = QPolygonF()
+        self._snapshot_display_front = QPolygonF()
+
+        # Recorded QPicture of the static scene (bed + toolpath) in world
+        # coordinates. Panning/zooming just replays it under the current
+        # transform instead of re-issuing every draw call; it is rebuilt
+        # only when the data or view mode changes. Cosmetic pens keep the
+        # stroke width scale-independent, so zooming never invalidates it.
+        self._scene_picture = None
+
+        # Coalesces repaint requests from high-rate input events (panning,
+        # wheel zoom) into at most one update per ~16 ms (60 Hz).
+        self._repaint_timer = QTimer(self)
+        self._repaint_timer.setSingleShot(True)
+        self._repaint_timer.setInterval(16)
+        self._repaint_timer.timeout.connect(self.update)
 
         self.bed_x = 220.0
         self.bed_y = 220.0
@@ -17,6 +88,12 @@ class GCodeViewer(QWidget):
         self.view_mode = 'top' # 'top' for XY view, 'front' for XZ view
 
         self.scale_factor = 1.0
+        # Derived per-scale value, refreshed by _on_scale_changed() instead
+        # of being recomputed every paint. Pen widths and marker sizes used
+        # to live here too, but cosmetic pens and device-space markers made
+        # them scale-independent; only the culling margin still depends on
+        # the scale.
+        self._cull_margin = 2.0
         self.offset_x = 0
         self.offset_y = 0
         self.panning = False
@@ -32,6 +109,29 @@ class GCodeViewer(QWidget):
 
         self.debug_mode = False # Internal debug mode, controllable by main app
 
+        # Pre-built paint objects, reused across paintEvents. Constructing
+        # QPen/QColor/QFont (and re-parsing the color strings) on every
+        # repaint is wasteful during panning/zooming; only the widths and
+        # font size are updated per paint.
+        self._background_color = QColor("#222222")
+        self._bed_pen = QPen(QColor("#666666"), 1)
+        self._toolpath_pen = QPen(QColor("#00FFFF"), 1)
+        # Marker pens are thick round-cap pens: drawing the marker sets
+        # with a single drawPoints call renders each point as a fixed-size
+        # round dot (3 px layer starts, 5 px snapshots).
+        self._layer_start_pen = QPen(QColor("#FFFF00"), 3)
+        self._layer_start_pen.setCapStyle(Qt.RoundCap)
+        self._snapshot_pen = QPen(QColor("#FF00FF"), 5)
+        self._snapshot_pen.setCapStyle(Qt.RoundCap)
+        self._snapshot_font = QFont("Arial", 10)
+        # Cosmetic pens keep their device-pixel width under any transform,
+        # so no per-frame width = k / scale_factor arithmetic is needed and
+        # Qt can use its fast cosmetic stroker.
+        self._bed_pen.setCosmetic(True)
+        self._toolpath_pen.setCosmetic(True)
+        self._layer_start_pen.setCosmetic(True)
+        self._snapshot_pen.setCosmetic(True)
+
     def set_debug_mode(self, enabled):
         """Enables or disables internal debug logging."""
         self.debug_mode = enabled
@@ -52,16 +152,36 @@ class GCodeViewer(QWidget):
         self.bed_y = max(1.0, float(y))
         self.max_z = max(1.0, float(max_z))
         self.log_debug(f"Bed dimensions set to X:{self.bed_x:.1f}, Y:{self.bed_y:.1f}, Max Z:{self.max_z:.1f}")
+        self._invalidate_scene()
         self.fit_to_view() # Recalculate scale and offset
         self.update() # Request a repaint
 
     def set_gcode_data(self, data):
         """
         Sets the G-code toolpath data.
-        Data is expected to be a list of (QPointF(x, y), z_value) tuples.
+        Accepts either the legacy list of (QPointF(x, y), z_value) tuples
+        or a NumPy array of shape (N, 3) holding x, y, z columns; either
+        way the path is stored internally as a contiguous float32 array.
         """
-        self.gcode_data = data
-        self.log_debug(f"G-code toolpath data set with {len(data)} points.")
+        if isinstance(data, np.ndarray):
+            self._xyz = np.ascontiguousarray(data, dtype=np.float32).reshape(-1, 3)
+        else:
+            self._xyz = np.fromiter(
+                (coord for p, z in data for coord in (p.x(), p.y(), z)),
+                dtype=np.float32, count=3 * len(data)
+            ).reshape(-1, 3)
+        # Cache the path bounding box in one vectorized pass (or None when
+        # empty) so later fit_to_view calls are O(1).
+        if len(self._xyz):
+            self._bbox = (self._xyz.min(axis=0), self._xyz.max(axis=0))
+        else:
+            self._bbox = None
+        # Drop the cached polylines; _toolpath_polyline() rebuilds them on
+        # demand for whichever view is actually painted.
+        self._toolpath_polyline_top = None
+        self._toolpath_polyline_front = None
+        self._invalidate_scene()
+        self.log_debug(f"G-code toolpath data set with {len(self._xyz)} points.")
         self.fit_to_view() # Recalculate scale and offset to fit new data
         self.update() # Request a repaint
 
@@ -71,6 +191,15 @@ class GCodeViewer(QWidget):
         Data is expected to be a list of (QPointF(x, y), z_value) tuples.
         """
         self.layer_start_points = points
+        # Precompute one point-set polygon per view mode; paintEvent hands
+        # each to Qt in a single drawPoints call.
+        xyz = np.fromiter(
+            (coord for p, z in points for coord in (p.x(), p.y(), z)),
+            dtype=np.float64, count=3 * len(points)
+        ).reshape(-1, 3)
+        self._layer_start_display_top = _polygon_from_xy(xyz[:, 0:2])
+        self._layer_start_display_front = _polygon_from_xy(xyz[:, 0:3:2])
+        self._invalidate_scene()
         self.log_debug(f"Layer start points set with {len(points)} points.")
         self.update()
 
@@ -79,17 +208,22 @@ class GCodeViewer(QWidget):
         Sets the processed snapshot points for visualization from the script.
         Data is expected to be a list of (x_coord, y_coord, z_value) tuples.
         """
-        # Convert raw (x,y,z) tuples from script to (QPointF(x,y), z) for internal use
-        self.processed_snapshot_points = []
-        for x, y, z in points:
-            self.processed_snapshot_points.append((QPointF(x, y), z))
-        self.log_debug(f"Processed snapshot points set with {len(self.processed_snapshot_points)} points.")
+        # Store the raw (x,y,z) tuples from the script as a float32 array —
+        # no per-point tuple/QPointF conversion loop.
+        self._snap_xyz = np.asarray(points, dtype=np.float32).reshape(-1, 3)
+        # Precompute one point-set polygon per view mode (done once per
+        # data load, outside the render hot path)
+        self._snapshot_display_top = _polygon_from_xy(self._snap_xyz[:, 0:2])
+        self._snapshot_display_front = _polygon_from_xy(self._snap_xyz[:, 0:3:2])
+        self._invalidate_scene()
+        self.log_debug(f"Processed snapshot points set with {len(self._snap_xyz)} points.")
         self.update()
 
     def set_view_mode(self, mode):
         """Sets the view mode ('top' or 'front')."""
         if mode in ['top', 'front']:
             self.view_mode = mode
+            self._invalidate_scene()
             self.log_debug(f"View mode set to: {mode}")
             self.fit_to_view() # Recalculate scale and offset for new view
             self.update()
@@ -112,8 +246,20 @@ class GCodeViewer(QWidget):
             content_width = self.bed_x
             content_height = self.max_z # Use max_z for height in front view
 
+        # Grow the content extents with the cached toolpath bounds so paths
+        # that run past the configured bed still fit. The bounds were
+        # computed once in set_gcode_data, so this stays O(1) per resize.
+        if self._bbox is not None:
+            _, bbox_max = self._bbox
+            content_width = max(content_width, float(bbox_max[0]))
+            if self.view_mode == 'top':
+                content_height = max(content_height, float(bbox_max[1]))
+            else:
+                content_height = max(content_height, float(bbox_max[2]))
+
         if content_width <= 0 or content_height <= 0: # Avoid division by zero
             self.scale_factor = 1.0
+            self._on_scale_changed()
             self.offset_x = 0
             self.offset_y = 0
             return
@@ -122,50 +268,179 @@ class GCodeViewer(QWidget):
         scale_x = (self.width() * padding_ratio) / content_width
         scale_y = (self.height() * padding_ratio) / content_height
         self.scale_factor = min(scale_x, scale_y)
+        self._on_scale_changed()
 
         # Calculate offset to center the content initially
         self.offset_x = (self.width() - content_width * self.scale_factor) / 2.0
         self.offset_y = (self.height() - content_height * self.scale_factor) / 2.0
 
-        self.log_debug(f"Fit to view: Scale={self.scale_factor:.2f}, Offset=({self.offset_x:.2f}, {self.offset_y:.2f}) for mode '{self.view_mode}'.")
+        if self.debug_mode:
+            self.log_debug(f"Fit to view: Scale={self.scale_factor:.2f}, Offset=({self.offset_x:.2f}, {self.offset_y:.2f}) for mode '{self.view_mode}'.")
 
 
     def paintEvent(self, event):
         """Paints the G-code toolpath and bed."""
+        # Nothing to do while the widget isn't actually on screen (e.g.
+        # minimized); skip transform and painter setup entirely.
+        if not self.isVisible():
+            return
+
         painter = QPainter(self)
         painter.setRenderHint(QPainter.Antialiasing)
 
         # Fill background
-        painter.fillRect(self.rect(), QColor("#222222")) # Dark background
+        painter.fillRect(self.rect(), self._background_color) # Dark background
 
-        full_transform = QTransform()
+        full_transform = self._full_transform()
+        painter.setTransform(full_transform)
 
-        # Step 1: Translate to center the content (based on offset_x, offset_y from fit_to_view)
-        full_transform.translate(self.offset_x, self.offset_y)
+        # When zoomed in so that part of the toolpath is off-screen, draw a
+        # culled polyline covering just the visible world rectangle instead
+        # of replaying the full cached scene. Otherwise replay the cached
+        # scene picture, rebuilding it only when the data has changed.
+        culled_runs = self._culled_toolpath_runs(full_transform)
+        if culled_runs is not None:
+            self._draw_bed(painter)
+            painter.setPen(self._toolpath_pen)
+            # Antialiasing is the dominant rasterization cost on a dense
+            # 1-pixel polyline and is invisible on overlapping toolpath
+            # strokes; keep it only for the bed and markers.
+            painter.setRenderHint(QPainter.Antialiasing, False)
+            for run in culled_runs:
+                painter.drawPolyline(run)
+            painter.setRenderHint(QPainter.Antialiasing, True)
+            if self.debug_mode:
+                self.log_debug(f"Drawing {len(culled_runs)} culled toolpath runs in {self.view_mode} view.")
+        else:
+            if self._scene_picture is None:
+                self._scene_picture = QPicture()
+                scene_painter = QPainter(self._scene_picture)
+                scene_painter.setRenderHint(QPainter.Antialiasing)
+                self._draw_scene(scene_painter)
+                scene_painter.end()
+            self._scene_picture.play(painter)
+
+        # Markers are drawn under the world transform; their cosmetic pens
+        # keep the dot sizes fixed in device pixels.
+        self._draw_markers(painter)
 
-        # Step 2: Apply the overall content scaling
-        full_transform.scale(self.scale_factor, self.scale_factor)
+        painter.end()
 
-        # Step 3: Apply view-specific transformations (flip and Z-origin shift for front view)
-        if self.view_mode == 'front':
-            # Scale Y by -1 to flip (positive world Z goes up on screen)
-            full_transform.scale(1, -1)
-            # Translate so that Z=0 (bed) appears at the bottom of the scaled height.
-            # After scaling and flipping, world_Z=0 is at Y=0, world_Z=max_Z is at Y=-max_Z.
-            # To move Z=0 (which is currently at Y=0 of the flipped/scaled content)
-            # to the bottom of the *scaled total height* (max_z * scale_factor),
-            # we need to translate the origin downwards by this amount.
-            full_transform.translate(0, -self.max_z) # This translates by the world max_z.
-                                                      # When scaled later this becomes max_z * scale_factor.
-                                                      # It means Z=0 (which is at Y=0 in the flipped space)
-                                                      # is moved down by self.max_z. This places Z=0 at the
-                                                      # bottom of the transformed space.
+    def _full_transform(self):
+        """
+        Returns the composed world-to-device transform, cached against the
+        view state so repaints with unchanged pan/zoom (focus changes,
+        expose events) reuse the matrix instead of recomposing it.
+        """
+        key = (self.offset_x, self.offset_y, self.scale_factor, self.view_mode, self.max_z)
+        if key != self._xform_key:
+            xform = QTransform()
+            # Step 1: Translate to center the content (based on offset_x,
+            # offset_y from fit_to_view)
+            xform.translate(self.offset_x, self.offset_y)
+            # Step 2: Apply the overall content scaling
+            xform.scale(self.scale_factor, self.scale_factor)
+            # Step 3: View-specific transformations for the front view
+            if self.view_mode == 'front':
+                # Scale Y by -1 to flip (positive world Z goes up on screen)
+                xform.scale(1, -1)
+                # Translate so that Z=0 (bed) appears at the bottom: after
+                # the flip, world Z=0 is at Y=0 and Z=max_z at Y=-max_z, so
+                # shifting the origin down by max_z puts the bed at the
+                # bottom of the transformed space.
+                xform.translate(0, -self.max_z)
+            self._xform = xform
+            self._xform_key = key
+        return self._xform
+
+    def _schedule_repaint(self):
+        """
+        Requests a repaint via the coalescing timer. Multiple calls within
+        one timer interval merge into a single update.
+        """
+        if not self._repaint_timer.isActive():
+            self._repaint_timer.start()
 
+    def _invalidate_scene(self):
+        """Marks the cached scene picture stale so the next paint rebuilds it."""
+        self._scene_picture = None
 
-        painter.setTransform(full_transform)
+    def _on_scale_changed(self):
+        """
+        Refreshes values derived from scale_factor. Called from the few
+        places that change the scale so paints read cached results.
+        """
+        # Two device pixels of slack around the visible rect when culling,
+        # expressed in world units.
+        self._cull_margin = 2.0 / self.scale_factor
+
+        # The cached polylines are decimated for a particular zoom; once
+        # the scale drifts more than 1.5x from the one they were built
+        # for, rebuild them (and the scene recording) at the new detail.
+        if self._decimation_scale is not None and not (
+                self._decimation_scale / 1.5 <= self.scale_factor <= self._decimation_scale * 1.5):
+            self._toolpath_polyline_top = None
+            self._toolpath_polyline_front = None
+            self._decimation_scale = None
+            self._invalidate_scene()
+
+    def _culled_toolpath_runs(self, transform):
+        """
+        Returns a list of QPolygonF runs covering only the toolpath
+        segments that overlap the visible world rectangle, or None when the
+        whole path is visible (the cached scene picture should be used).
+        """
+        if not len(self._xyz) or self._bbox is None:
+            return None
 
-        # Draw print bed
-        painter.setPen(QPen(QColor("#666666"), 1 / self.scale_factor)) # Scale pen width
+        inverted, invertible = transform.inverted()
+        if not invertible:
+            return None
+        world_rect = inverted.mapRect(QRectF(self.rect()))
+
+        # Pick the on-screen coordinate columns for the active view
+        if self.view_mode == 'top':
+            coords = self._xyz[:, 0:2]
+            vertical_axis = 1
+        else: # 'front' view uses X and Z
+            coords = self._xyz[:, 0:3:2]
+            vertical_axis = 2
+
+        bbox_min, bbox_max = self._bbox
+        path_rect = QRectF(QPointF(float(bbox_min[0]), float(bbox_min[vertical_axis])),
+                           QPointF(float(bbox_max[0]), float(bbox_max[vertical_axis])))
+        if world_rect.contains(path_rect):
+            return None # Everything is visible; no point filtering
+
+        # Mask points inside the visible rect (with a small pixel margin),
+        # then extend each kept run by one vertex on both sides so segments
+        # crossing the viewport edge keep their off-screen endpoint.
+        margin = self._cull_margin
+        x0, x1 = world_rect.left() - margin, world_rect.right() + margin
+        y0, y1 = world_rect.top() - margin, world_rect.bottom() + margin
+        mask = ((coords[:, 0] >= x0) & (coords[:, 0] <= x1) &
+                (coords[:, 1] >= y0) & (coords[:, 1] <= y1))
+        extended = mask.copy()
+        extended[1:] |= mask[:-1]
+        extended[:-1] |= mask[1:]
+
+        kept_indices = np.flatnonzero(extended)
+        if kept_indices.size == 0:
+            return []
+
+        # Split into contiguous runs so drawPolyline never bridges a gap
+        # between two disjoint visible sections of the path.
+        run_breaks = np.flatnonzero(np.diff(kept_indices) > 1) + 1
+        runs = []
+        for indices in np.split(kept_indices, run_breaks):
+            if indices.size < 2:
+                continue
+            runs.append(_polygon_from_xy(coords[indices]))
+        return runs
+
+    def _draw_bed(self, painter):
+        """Draws the print bed outline in world coordinates."""
+        painter.setPen(self._bed_pen)
         painter.setBrush(Qt.NoBrush)
 
         if self.view_mode == 'top':
@@ -174,75 +449,95 @@ class GCodeViewer(QWidget):
             # Draw center lines for bed
             painter.drawLine(int(self.bed_x / 2), 0, int(self.bed_x / 2), int(self.bed_y))
             painter.drawLine(0, int(self.bed_y / 2), int(self.bed_x), int(self.bed_y / 2))
-            self.log_debug(f"Drawing top view bed: {self.bed_x}x{self.bed_y}")
+            if self.debug_mode:
+                self.log_debug(f"Drawing top view bed: {self.bed_x}x{self.bed_y}")
         else: # 'front' view
             # In front view (XZ), bed is a line at Z=0
             painter.drawLine(0, 0, int(self.bed_x), 0)
-            self.log_debug(f"Drawing front view bed line: {self.bed_x} at Z=0")
-
-
-        # Draw G-code toolpath
-        if self.gcode_data:
-            painter.setPen(QPen(QColor("#00FFFF"), 0.5 / self.scale_factor)) # Cyan for toolpath
-            last_point = None
-            for point_qpointf, z_val in self.gcode_data:
-                # Decide which coordinates to use based on view mode
-                if self.view_mode == 'top':
-                    current_point_display = point_qpointf
-                else: # 'front' view
-                    # X remains X, Y becomes Z
-                    current_point_display = QPointF(point_qpointf.x(), z_val)
-
-                if last_point:
-                    painter.drawLine(last_point, current_point_display)
-                last_point = current_point_display
-            self.log_debug(f"Drawing {len(self.gcode_data)} toolpath points in {self.view_mode} view.")
+            if self.debug_mode:
+                self.log_debug(f"Drawing front view bed line: {self.bed_x} at Z=0")
 
+    def _draw_scene(self, painter):
+        """
+        Draws the bed and toolpath in world coordinates.
+        Recorded into the cached QPicture; not called directly per repaint.
+        """
+        self._draw_bed(painter)
+
+        # Draw G-code toolpath. Antialiasing is skipped for the toolpath
+        # strokes (see paintEvent): it roughly doubles rasterization cost
+        # and makes no visible difference on dense overlapping lines.
+        if len(self._xyz):
+            painter.setPen(self._toolpath_pen) # Cyan for toolpath
+            painter.setRenderHint(QPainter.Antialiasing, False)
+            painter.drawPolyline(self._toolpath_polyline())
+            painter.setRenderHint(QPainter.Antialiasing, True)
+            if self.debug_mode:
+                self.log_debug(f"Drawing {len(self._xyz)} toolpath points in {self.view_mode} view.")
+
+    def _toolpath_polyline(self):
+        """
+        Returns the cached toolpath polyline for the active view, building
+        it on first use. Only the displayed view pays the construction
+        cost; switching views builds the other one on demand.
+        """
+        if self.view_mode == 'top':
+            if self._toolpath_polyline_top is None:
+                self._toolpath_polyline_top = _polygon_from_xy(
+                    self._decimated_xy(self._xyz[:, 0:2]))
+                self._decimation_scale = self.scale_factor
+            return self._toolpath_polyline_top
+        if self._toolpath_polyline_front is None:
+            self._toolpath_polyline_front = _polygon_from_xy(
+                self._decimated_xy(self._xyz[:, 0:3:2]))
+            self._decimation_scale = self.scale_factor
+        return self._toolpath_polyline_front
+
+    def _decimated_xy(self, coords):
+        """
+        Drops vertices whose segment to the previous vertex is shorter
+        than half a device pixel at the current zoom. Dense prints have
+        far more sub-pixel segments than visible ones, so rendering cost
+        tracks on-screen detail instead of total segment count.
+        """
+        n = len(coords)
+        if n < 3:
+            return coords
+        min_seg = 0.5 / self.scale_factor
+        deltas = np.diff(coords, axis=0)
+        keep = np.empty(n, dtype=bool)
+        keep[0] = True
+        keep[1:] = (deltas[:, 0] ** 2 + deltas[:, 1] ** 2) > (min_seg * min_seg)
+        keep[-1] = True # Always keep the final position
+        return coords[keep]
+
+    def _draw_markers(self, painter):
+        """
+        Draws layer-start and snapshot markers as batched point sets.
+        Each group is one drawPoints call on its precomputed world-space
+        polygon; the thick cosmetic round-cap pens render every point as a
+        fixed-size device-pixel dot regardless of zoom.
+        """
         # Draw detected layer start points (before processing)
         if self.layer_start_points:
-            painter.setPen(QPen(QColor("#FFFF00"), 1 / self.scale_factor)) # Yellow circles
-            dot_size = 3 / self.scale_factor # Make dot size scale with zoom
-            for point_qpointf, z_val in self.layer_start_points:
-                if self.view_mode == 'top':
-                    display_point = point_qpointf
-                else: # 'front' view
-                    display_point = QPointF(point_qpointf.x(), z_val)
-                
-                # Draw a small circle
-                # drawEllipse expects int for x, y, w, h
-                painter.drawEllipse(int(display_point.x() - dot_size / 2), int(display_point.y() - dot_size / 2), int(dot_size), int(dot_size))
-            self.log_debug(f"Drawing {len(self.layer_start_points)} layer start points in {self.view_mode} view.")
+            painter.setPen(self._layer_start_pen) # Yellow dots
+            painter.drawPoints(self._layer_start_display_top if self.view_mode == 'top' else self._layer_start_display_front)
+            if self.debug_mode:
+                self.log_debug(f"Drawing {len(self.layer_start_points)} layer start points in {self.view_mode} view.")
 
         # Draw processed snapshot points (after script processing)
-        if self.processed_snapshot_points:
-            painter.setPen(QPen(QColor("#FF00FF"), 1 / self.scale_factor)) # Magenta circles
-            dot_size = 5 / self.scale_factor # Slightly larger dots for processed points
-            font_size = max(1, int(10 / self.scale_factor)) # Scale font size
-            font = QFont("Arial", font_size)
-            painter.setFont(font)
-
-            for point_xy, z_val in self.processed_snapshot_points:
-                if self.view_mode == 'top':
-                    display_point = point_xy
-                else: # 'front' view
-                    display_point = QPointF(point_xy.x(), z_val)
-
-                # Draw a larger circle for snapshots
-                # drawEllipse expects int for x, y, w, h
-                painter.drawEllipse(int(display_point.x() - dot_size / 2), int(display_point.y() - dot_size / 2), int(dot_size), int(dot_size))
-                
-                # Optionally draw a number next to the snapshot point (for debugging/identification)
-                # Not crucial for normal operation, can be commented out if too cluttered
-                # painter.drawText(display_point.x() + dot_size, display_point.y() + dot_size, f"Z:{z_val:.1f}")
-            self.log_debug(f"Drawing {len(self.processed_snapshot_points)} processed snapshot points in {self.view_mode} view.")
-
-
-        painter.end()
+        if len(self._snap_xyz):
+            painter.setPen(self._snapshot_pen) # Magenta dots
+            painter.setFont(self._snapshot_font)
+            painter.drawPoints(self._snapshot_display_top if self.view_mode == 'top' else self._snapshot_display_front)
+            if self.debug_mode:
+                self.log_debug(f"Drawing {len(self._snap_xyz)} processed snapshot points in {self.view_mode} view.")
 
 
     def resizeEvent(self, event):
         """Handles widget resize events."""
-        self.log_debug(f"Resize event: New size {event.size().width()}x{event.size().height()}")
+        if self.debug_mode:
+            self.log_debug(f"Resize event: New size {event.size().width()}x{event.size().height()}")
         self.fit_to_view() # Recalculate scale and offset on resize
         super().resizeEvent(event)
 
@@ -269,41 +564,42 @@ class GCodeViewer(QWidget):
             self.offset_x += delta_x
             self.offset_y += delta_y
             self.last_pos = event.pos()
-            self.update() # Request repaint for smooth panning
-            self.log_debug(f"Panning: Delta=({delta_x}, {delta_y}), New Offset=({self.offset_x:.2f}, {self.offset_y:.2f})")
+            self._schedule_repaint() # Request repaint for smooth panning
+            if self.debug_mode:
+                self.log_debug(f"Panning: Delta=({delta_x}, {delta_y}), New Offset=({self.offset_x:.2f}, {self.offset_y:.2f})")
         
         # You could add hover coordinates here if desired
         # self.log_debug(f"Mouse moved to: {event.pos().x()}, {event.pos().y()}")
 
 
     def wheelEvent(self, event):
-        """Handles mouse wheel for zooming."""
+        """Handles mouse wheel for zooming, anchored at the cursor position."""
         zoom_factor = 1.15 # Zoom by 15%
         # Zoom around the mouse cursor position (a more intuitive zoom)
         mouse_x = event.pos().x()
         mouse_y = event.pos().y()
 
         # Convert mouse position to "world" coordinates before scaling
-        # current_world_x = (mouse_x - self.offset_x) / self.scale_factor
-        # current_world_y = (mouse_y - self.offset_y) / self.scale_factor
+        world_x = (mouse_x - self.offset_x) / self.scale_factor
+        world_y = (mouse_y - self.offset_y) / self.scale_factor
 
         if event.angleDelta().y() > 0: # Zoom in
             self.scale_factor *= zoom_factor
-            self.log_debug(f"Zooming in. New scale: {self.scale_factor:.2f}")
+            if self.debug_mode:
+                self.log_debug(f"Zooming in. New scale: {self.scale_factor:.2f}")
         else: # Zoom out
             self.scale_factor /= zoom_factor
-            self.log_debug(f"Zooming out. New scale: {self.scale_factor:.2f}")
-        
-        # Re-adjust offset to keep mouse cursor at the same "world" spot
-        # new_offset_x = mouse_x - current_world_x * self.scale_factor
-        # new_offset_y = mouse_y - current_world_y * self.scale_factor
-        # This more complex zoom-to-cursor logic is sometimes tricky with 2D transforms and coordinate systems
-        # For simplicity, for now, we'll just zoom around the center and let the user pan.
-        # Alternatively, recalculate offset based on top-left of the bounding box of the content
-        # For now, just call fit_to_view after zoom to keep it centered if desired, or let panning handle it.
-        # Calling fit_to_view would reset the user's pan. For better UX, only fit_to_view on initial load/resize.
-        
-        self.update() # Request repaint for smooth zooming
+            if self.debug_mode:
+                self.log_debug(f"Zooming out. New scale: {self.scale_factor:.2f}")
+
+        self._on_scale_changed()
+
+        # Re-adjust offset so the world point under the cursor stays put.
+        # Constant work per wheel tick — no fit_to_view, no pan reset.
+        self.offset_x = mouse_x - world_x * self.scale_factor
+        self.offset_y = mouse_y - world_y * self.scale_factor
+
+        self._schedule_repaint() # Request repaint for smooth zooming
 
     def keyPressEvent(self, event):
         """Handles key presses for additional controls (e.g., reset view)."""
@@ -1,17 +1,22 @@
 import sys
 import os
 import time
+import html
 import json
 import re
+from collections import OrderedDict
+from functools import partial
+
+import numpy as np
 
 from PyQt5.QtWidgets import (
-    QApplication, QMainWindow, QFileDialog, QTextEdit, QLabel,
+    QApplication, QMainWindow, QFileDialog, QPlainTextEdit, QLabel,
     QWidget, QVBoxLayout, QHBoxLayout, QSplitter, QFrame, QAction, QMenuBar,
     QComboBox, QProgressBar, QGroupBox, QFormLayout, QDoubleSpinBox, QSpinBox,
     QPushButton, QCheckBox, QMessageBox, QSizePolicy
 )
-from PyQt5.QtGui import QIcon, QTextCharFormat, QColor, QFont, QTextCursor
-from PyQt5.QtCore import Qt, QRegExp, QThread, pyqtSignal, QObject, QPointF 
+from PyQt5.QtGui import QIcon
+from PyQt5.QtCore import Qt, QRegExp, QThread, QTimer, pyqtSignal, QObject, QPointF 
 
 from config import load_settings, save_settings, DEFAULT_SETTINGS 
 from gcode_viewer import GCodeViewer 
@@ -31,25 +36,141 @@ APP_VERSION = "1.0.0"
 MIN_BED_DIMENSION = 50.0 # Minimum reasonable bed dimension in mm
 DEFAULT_BED_X = 220.0
 DEFAULT_BED_Y = 220.0
+# Most log lines the console keeps before recycling the oldest ones.
+MAXIMUM_LOG_BLOCKS = 5000
+
+# How much of each script file load_scripts reads when looking for the
+# "# SCRIPT_SETTINGS:" header line. The marker is a header convention
+# (both bundled scripts put it on line 1), so there is no need to walk
+# the whole file.
+SCRIPT_SETTINGS_SCAN_BYTES = 8192
+
+# Cache of parsed SCRIPT_SETTINGS headers, stored alongside the scripts
+# and keyed by each file's mtime, so startup reuses the parsed settings
+# for unmodified scripts instead of re-reading and re-decoding them.
+SCRIPT_SETTINGS_CACHE_FILE = ".printpath_cache.json"
+
+# Most recently parsed files kept in the in-memory parse-result cache
+# (keyed by path, mtime and size), so re-opening an unchanged file skips
+# the whole parse thread.
+PARSE_CACHE_MAX_ENTRIES = 4
+
+# Spinbox settings whose maximum is clamped by the print's total layer
+# count when a file has been parsed.
+LAYER_DEPENDENT_SETTINGS = frozenset({"num_snapshots", "num_orbits"})
+
+# Preview perspectives offered by the view-mode combo box, in display
+# order. Index-based restores avoid linear string matching per startup.
+VIEW_MODES = ("Top View (XY)", "Front View (XZ)")
+# How long buffered log messages wait before being flushed to the console
+# in one append (coalesces bursty logging into a few layout passes).
+LOG_FLUSH_INTERVAL_MS = 50
+
+# Bounded header pre-scan: slicer metadata lives in the first few thousand
+# lines of the file (and occasionally in a settings block at the tail), so
+# the info patterns are run over just these slices up front instead of
+# hoping the completion check fires somewhere mid-file.
+HEADER_SCAN_BYTES = 256 * 1024
+FOOTER_SCAN_BYTES = 64 * 1024
+# How many extra lines the header scan keeps looking for bed dimensions
+# after every other header field is known. Some slicer profiles never
+# emit bed-size comments, so without a cutoff the header patterns would
+# run against every remaining line of the file for nothing.
+BED_INFO_SCAN_EXTRA_LINES = 5000
 # New constant: Minimum acceptable dimension for a *model* bounding box (to distinguish from prime lines/skirts)
-MIN_MODEL_DIMENSION_THRESHOLD = 50.0 
-
+MIN_MODEL_DIMENSION_THRESHOLD = 50.0
+
+# Regexes used in the per-line parsing loops, compiled once at import time.
+# G-code is plain ASCII, so re.ASCII lets the character classes skip the
+# Unicode tables.
+GCODE_MOVE_PATTERN = re.compile(r"^(G0|G1)\s*(?:X([-\d.]+))?\s*(?:Y([-\d.]+))?\s*(?:Z([-\d.]+))?\s*(?:E([-\d.]+))?.*$", re.ASCII)
+LAYER_COMMENT_PATTERN = re.compile(r";LAYER:(\d+)", re.ASCII)
+
+# All header-info comment patterns folded into one alternation, so the info
+# parser scans each line once instead of running every field's regex
+# separately. Each alternative carries uniquely named groups; the dispatch
+# in _parse_info_line keys off which of them matched.
+# Literals are written upper-case and matched against an upper-cased line
+# instead of using re.IGNORECASE: the flag defeats the engine's fast
+# literal scanning, and one .upper() per header line is cheaper than a
+# case-insensitive scan per alternative.
+HEADER_INFO_PATTERN = re.compile(
+    r";\s*GCODE_FLAVOR\s*=\s*(?P<flavor>\w+)"
+    r"|;\s*TOTAL LAYER NUMBER:\s*(?P<layers_total>\d+)"
+    r"|LAYERS:\s*(?P<layers>\d+)"
+    r"|^;MAX_LAYER:\s*(?P<max_layer>\d+)"
+    r"|POLYGON=\[\[(?P<poly_x1>[-+]?\d*\.?\d+),(?P<poly_y1>[-+]?\d*\.?\d+)\],\[(?P<poly_x2>[-+]?\d*\.?\d+),(?P<poly_y2>[-+]?\d*\.?\d+)\],\[(?P<poly_x3>[-+]?\d*\.?\d+),(?P<poly_y3>[-+]?\d*\.?\d+)\],\[(?P<poly_x4>[-+]?\d*\.?\d+),(?P<poly_y4>[-+]?\d*\.?\d+)\]"
+    r"|X\[(?P<bbox_x1>[-+]?\d*\.?\d+):(?P<bbox_x2>[-+]?\d*\.?\d+)\]\s*Y\[(?P<bbox_y1>[-+]?\d*\.?\d+):(?P<bbox_y2>[-+]?\d*\.?\d+)\](?:\s*Z\[(?P<bbox_z1>[-+]?\d*\.?\d+):(?P<bbox_z2>[-+]?\d*\.?\d+)\])?"
+    r"|(?:MAX_Z_HEIGHT|MAX_Z)\s*[=:]\s*(?P<maxz>[-+]?\d*\.?\d+)"
+    r"|(?:BED_SIZE|PRINT_BED_SIZE|BED_SHAPE)\s*[=:]\s*(?P<bed_x>\S+?)(?:X|,\s*)(?P<bed_y>\S+)"
+    r"|;\s*PRINTABLE_AREA\s*=\s*[-\d.]+X[-\d.]+,\s*[-\d.]+X[-\d.]+,\s*(?P<pa_x>[-\d.]+)X(?P<pa_y>[-\d.]+),",
+    re.ASCII)
+
+
+# Cache of loaded script run functions keyed by script path, storing the
+# file's mtime alongside so an edited script is transparently reloaded on
+# the next run while repeat runs skip the read/compile/exec entirely.
+_script_cache = {}
 
 def load_script(mode):
     """
     Dynamically loads and returns the 'run' function from a script
-    located in the SCRIPTS_DIR.
+    located in the SCRIPTS_DIR. Results are cached against the script
+    file's modification time, so processing the same mode repeatedly
+    doesn't recompile the script each time.
     """
     script_path = os.path.join(SCRIPTS_DIR, f"{mode}.py")
-    if not os.path.exists(script_path):
+    try:
+        mtime = os.stat(script_path).st_mtime_ns
+    except FileNotFoundError:
         raise FileNotFoundError(f"Script '{mode}' not found at {script_path}.")
+
+    cached = _script_cache.get(script_path)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+
     scope = {}
     with open(script_path, "r") as f:
-        exec(f.read(), scope)
+        # Compile with the real filename so tracebacks from the script
+        # point at the file instead of "<string>".
+        exec(compile(f.read(), script_path, "exec"), scope)
     if "run" not in scope:
         raise AttributeError(f"Script '{mode}' does not define a 'run' function.")
+    _script_cache[script_path] = (mtime, scope["run"])
     return scope["run"]
 
+# Processed-output writes go through a large explicit buffer and are fed
+# to it in slices of this size, so CPython never copies the whole
+# (potentially hundreds of MB) string into the stdio layer at once.
+SAVE_CHUNK_BYTES = 1 << 20
+
+# CLI mode overlaps reading the input file with the parse pass: the main
+# thread reads blocks of roughly this many bytes and feeds them through a
+# bounded queue to a parser running on a worker thread. The small queue
+# depth provides backpressure so a fast disk can't balloon memory ahead
+# of the parser.
+CLI_READ_BLOCK_BYTES = 64 * 1024
+CLI_READ_QUEUE_DEPTH = 8
+
+def _write_gcode_file(filepath, content):
+    """
+    Writes a processed G-code string to filepath. The string is encoded
+    to bytes once up front (so the text layer doesn't re-encode per
+    chunk, and the binary writes release the GIL for the Qt event loop)
+    and written in large chunks through a temp file + os.replace, so a
+    crash mid-write can never leave a truncated output file behind —
+    same atomic pattern as config.flush_settings.
+    """
+    data = content.encode("utf-8") if isinstance(content, str) else content
+    tmp_path = filepath + ".tmp"
+    with open(tmp_path, "wb", buffering=SAVE_CHUNK_BYTES) as f:
+        if hasattr(os, "posix_fadvise"):
+            os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        for i in range(0, len(data), SAVE_CHUNK_BYTES):
+            f.write(data[i:i + SAVE_CHUNK_BYTES])
+    os.replace(tmp_path, filepath)
+
+
 # Helper class to redirect stdout to a signal
 class StreamRedirect(QObject):
     """Redirects stdout to a Qt signal and also prints to the original console."""
@@ -64,29 +185,38 @@ class StreamRedirect(QObject):
         # Use the provided fallback_stderr or the globally captured one
         self._fallback_stderr = fallback_stderr if fallback_stderr is not None else ORIGINAL_STDERR 
 
+    # Prefixes that override the default log type. Class-level so write()
+    # doesn't rebuild the tuple on every print call.
+    _TYPE_PREFIXES = (("WARNING:", "warning"), ("ERROR:", "error"), ("DEBUG:", "debug"))
+
     def write(self, text):
-        if text.strip(): # Only emit if there's actual text
-            # Determine log type based on message content
-            msg_type = self._default_log_type
-            if text.strip().upper().startswith("WARNING:"):
-                msg_type = "warning"
-            elif text.strip().upper().startswith("ERROR:"):
-                msg_type = "error"
-            elif text.strip().upper().startswith("DEBUG:"):
-                msg_type = "debug"
-            
-            # Emit signal to update GUI log console
-            self._log_signal.emit(text.strip(), msg_type)
-            
-            # Write to the original stdout to ensure console output
-            if self._original_stdout:
-                try:
-                    self._original_stdout.write(f"[{msg_type.upper()}] {text}\n") # Added newline for clarity in console
-                    self._original_stdout.flush()
-                except Exception as e:
-                    # Fallback print using built-in print() to captured stderr
-                    print(f"Error writing to original_stdout: {e} - Message: {text}", file=self._fallback_stderr)
-                    self._fallback_stderr.flush()
+        # write() runs once per print() from worker scripts, so strip and
+        # classify once instead of re-stripping/upper-casing per test.
+        stripped = text.strip()
+        if not stripped: # Only emit if there's actual text
+            return
+
+        # Determine log type from the message prefix; only the first few
+        # characters need upper-casing for the comparison.
+        msg_type = self._default_log_type
+        head = stripped[:8].upper()
+        for prefix, prefix_type in self._TYPE_PREFIXES:
+            if head.startswith(prefix):
+                msg_type = prefix_type
+                break
+
+        # Emit signal to update GUI log console
+        self._log_signal.emit(stripped, msg_type)
+
+        # Write to the original stdout to ensure console output
+        if self._original_stdout:
+            try:
+                self._original_stdout.write(f"[{msg_type.upper()}] {text}\n") # Added newline for clarity in console
+                self._original_stdout.flush()
+            except Exception as e:
+                # Fallback print using built-in print() to captured stderr
+                print(f"Error writing to original_stdout: {e} - Message: {text}", file=self._fallback_stderr)
+                self._fallback_stderr.flush()
 
     def flush(self):
         if self._original_stdout:
@@ -100,8 +230,9 @@ class GCodeProcessorThread(QThread):
     preventing the GUI from freezing.
     """
     # MODIFIED SIGNAL: Now emits a list of (x,y,z) tuples for snapshots
-    # Signals: original_filepath, processed_content (str), mode (str), snapshot_points (list of (x,y,z))
-    finished = pyqtSignal(str, str, str, list) 
+    # Signals: original_filepath, processed_content (str), mode (str),
+    # snapshot_points (list of (x,y,z)), snapshot_count (int)
+    finished = pyqtSignal(str, str, str, list, int) 
     error = pyqtSignal(str) # Signal for error messages
     log_signal = pyqtSignal(str, str) # Signal for logging messages: (message, type)
 
@@ -124,18 +255,32 @@ class GCodeProcessorThread(QThread):
             # Pass sys.__stderr__ explicitly to StreamRedirect
             sys.stdout = StreamRedirect(self.log_signal, "debug" if self.settings.get("debug_mode", False) else "info", self.old_stdout, sys.__stderr__)
             
-            with open(self.filepath, "r") as f:
-                gcode_lines = f.readlines()
+            # Read the file as one bytes blob and decode/split in bulk:
+            # noticeably faster than readlines() through TextIOWrapper's
+            # incremental decoder on 100MB+ files, while still handing the
+            # script the list of str lines its contract expects.
+            with open(self.filepath, "rb") as f:
+                raw = f.read()
+            gcode_lines = raw.decode("utf-8", errors="replace").splitlines(keepends=True)
+            del raw
 
             run_func = load_script(self.mode)
             
             # MODIFIED: Expect run_func to return processed_gcode_lines (list of strings)
             # AND a list of snapshot_points (list of (x,y,z) tuples).
             new_lines, snapshot_points = run_func(self.settings, gcode_lines)
+            # Drop the input lines before joining the output so peak memory
+            # holds two copies of the file instead of three.
+            del gcode_lines
             processed_content = "".join(new_lines)
+            del new_lines
+
+            # Count the inserted frame commands here, off the GUI thread,
+            # so the main thread never scans the full output buffer.
+            snapshot_count = processed_content.count("TIMELAPSE_TAKE_FRAME")
 
             # MODIFIED: Emit snapshot_points along with other data
-            self.finished.emit(self.filepath, processed_content, self.mode, snapshot_points)
+            self.finished.emit(self.filepath, processed_content, self.mode, snapshot_points, snapshot_count)
 
         except FileNotFoundError as e:
             self.error.emit(f"Error: {e}")
@@ -150,6 +295,31 @@ class GCodeProcessorThread(QThread):
             if self.old_stdout: # Ensure stdout is restored
                 sys.stdout = self.old_stdout
 
+# --- Worker Thread for saving processed output ---
+class GCodeSaveThread(QThread):
+    """
+    A QThread subclass that writes processed G-code to disk, so the GUI
+    thread never blocks on a large file write (pure I/O releases the GIL).
+    """
+    finished = pyqtSignal(str) # Signal: saved filepath
+    error = pyqtSignal(str, str) # Signals: filepath, error message
+
+    def __init__(self, filepath, content):
+        super().__init__()
+        self.filepath = filepath
+        self.content = content
+
+    def run(self):
+        """
+        Writes the content and reports the outcome via signals.
+        """
+        try:
+            _write_gcode_file(self.filepath, self.content)
+            self.finished.emit(self.filepath)
+        except Exception as e:
+            self.error.emit(self.filepath, str(e))
+
+
 # --- Worker Thread for G-code File Parsing (for preview) ---
 class GCodeParseThread(QThread):
     """
@@ -157,7 +327,8 @@ class GCodeParseThread(QThread):
     bed dimensions and toolpath data for the previewer.
     """
     # MODIFIED signal: now emits toolpath_bounds dict
-    finished = pyqtSignal(dict, list, list, dict) # Signals: gcode_info, toolpath_data, layer_start_points, toolpath_bounds
+    # toolpath_data is an (N, 3) float32 ndarray, hence the object slot
+    finished = pyqtSignal(dict, object, list, dict) # Signals: gcode_info, toolpath_data, layer_start_points, toolpath_bounds
     error = pyqtSignal(str) # Signal for error messages
     log_signal = pyqtSignal(str, str) # Signal for logging messages: (message, type)
 
@@ -166,6 +337,36 @@ class GCodeParseThread(QThread):
         self.filepath = filepath
         self.old_stdout = None # To store the original stdout
         self.is_relative_positioning = False # Internal state for parsing
+        # Line number past which the header scan stops waiting for bed
+        # dimensions (set once every other header field is known).
+        self._bed_scan_deadline = None
+        # Buffer for debug-level log lines. Every log_signal.emit crosses
+        # threads through Qt's queued-connection machinery, so per-line
+        # debug emits can dominate parse time on big files; debug messages
+        # are batched here and flushed in chunks instead. Warnings and
+        # errors still emit immediately.
+        self._log_buf = []
+
+    # Flush the debug buffer once it reaches this many lines.
+    _LOG_FLUSH_THRESHOLD = 1000
+
+    def _dlog(self, msg):
+        """
+        Queues a debug-level log message, flushing the buffer as a single
+        emit once it fills up. Use for per-line diagnostics inside the
+        parse loop; warnings/errors should emit directly.
+        """
+        self._log_buf.append(msg)
+        if len(self._log_buf) >= self._LOG_FLUSH_THRESHOLD:
+            self._flush_log()
+
+    def _flush_log(self):
+        """
+        Emits any buffered debug messages as one joined log_signal emit.
+        """
+        if self._log_buf:
+            self.log_signal.emit("\n".join(self._log_buf), "debug")
+            self._log_buf.clear()
 
     def run(self):
         """
@@ -180,12 +381,17 @@ class GCodeParseThread(QThread):
 
             self.log_signal.emit(f"Parsing G-code file: {os.path.basename(self.filepath)}", "info")
 
+            # Bounded header pre-scan: run the info patterns over the head
+            # (and, if needed, tail) slices of the file first, so the
+            # streaming pass below usually never has to touch them.
+            info, info_done = self._scan_header_info()
+
+            # Single streaming pass: header info and toolpath are extracted
+            # from one iteration over the open file, holding one line at a
+            # time instead of an O(file size) list and never re-reading the
+            # file for a second scan.
             with open(self.filepath, "r") as f:
-                gcode_lines = f.readlines()
-            
-            gcode_info = self._parse_gcode_info_main_app(gcode_lines)
-            # MODIFIED: _parse_gcode_toolpath now returns toolpath_bounds
-            toolpath_data, layer_start_points, toolpath_bounds = self._parse_gcode_toolpath(gcode_lines)
+                gcode_info, toolpath_data, layer_start_points, toolpath_bounds = self._parse_gcode(f, info, info_done)
 
             # MODIFIED: Emit toolpath_bounds along with other data
             self.finished.emit(gcode_info, toolpath_data, layer_start_points, toolpath_bounds)
@@ -197,155 +403,125 @@ class GCodeParseThread(QThread):
             self.error.emit(f"An unexpected error occurred during G-code parsing: {e}")
             self.log_signal.emit(f"An unexpected error occurred during G-code parsing: {e}", "error")
         finally:
+            # Deliver any still-buffered debug messages before finishing.
+            self._flush_log()
             if self.old_stdout: # Ensure stdout is restored
                 sys.stdout = self.old_stdout
 
-    def _parse_gcode_info_main_app(self, lines):
+    def _parse_info_line(self, line, line_num, info):
         """
-        Parses G-code lines to extract various information for the main app UI.
-        This is a more comprehensive parser than the one in scripts.
+        Applies the header-info patterns to a single stripped, upper-cased
+        line (the pattern literals are upper-case so the engine can run
+        without re.IGNORECASE),
+        updating info in place. Returns True once every field, including
+        validated bed dimensions, has been found, so the fused parse loop
+        can stop running the header patterns for the rest of the file.
+        All patterns are folded into the single HEADER_INFO_PATTERN
+        alternation, so each line is scanned once instead of once per
+        field regex; the named-group dispatch below applies whichever
+        alternative matched.
         """
-        info = {
-            "total_layers": None, "gcode_flavor": None,
-            "min_x": None, "max_x": None,
-            "min_y": None, "max_y": None,
-            "max_z": None,
-            "bed_dimensions": None 
-        }
-
-        self.log_signal.emit("Starting G-code info parsing...", "debug")
-        for line_num, line in enumerate(lines):
-            line_upper = line.strip().upper()
+        for m in HEADER_INFO_PATTERN.finditer(line):
+            g = m.groupdict()
 
             # G-code flavor
-            if info["gcode_flavor"] is None:
-                match = re.search(r";\s*gcode_flavor\s*=\s*(\w+)", line, re.IGNORECASE)
-                if match:
-                    flavor = match.group(1).lower()
-                    if flavor in ["klipper", "marlin"]:
-                        info["gcode_flavor"] = flavor
-                        # self.log_signal.emit(f"Line {line_num + 1}: Detected G-code flavor: {flavor}", "debug") # Removed verbose debug
-            
-            # Total layers
-            if info["total_layers"] is None:
-                match = re.search(r";\s*total layer number:\s*(\d+)", line, re.IGNORECASE)
-                if match: info["total_layers"] = int(match.group(1))
-                if info["total_layers"] is None:
-                    match = re.search(r"LAYERS:\s*(\d+)", line_upper)
-                    if match: info["total_layers"] = int(match.group(1))
-                if info["total_layers"] is None and line_upper.startswith(";TOTAL_LAYERS:"):
-                    try: info["total_layers"] = int(line_upper.split(":")[1].strip())
-                    except ValueError: pass
-                if info["total_layers"] is None and line_upper.startswith(";MAX_LAYER:"):
-                    try: info["total_layers"] = int(line_upper.split(":")[1].strip()) + 1
-                    except ValueError: pass
-                if info["total_layers"] is not None:
-                    # self.log_signal.emit(f"Line {line_num + 1}: Detected total layers: {info['total_layers']}", "debug") # Removed verbose debug
-                    pass
-
-
-            # Object Bounding Box (Initial comment-based parsing, can be overridden by toolpath later)
-            if info["min_x"] is None:
-                exclude_obj_match = re.search(r"POLYGON=\[\[([-+]?\d*\.?\d+),([-+]?\d*\.?\d+)\],\[([-+]?\d*\.?\d+),([-+]?\d*\.?\d+)\],\[([-+]?\d*\.?\d+),([-+]?\d*\.?\d+)\],\[([-+]?\d*\.?\d+),([-+]?\d*\.?\d+)\]", line, re.IGNORECASE)
-                if exclude_obj_match:
-                    try:
-                        coords = [float(exclude_obj_match.group(i)) for i in range(1, 9)]
-                        xs = [coords[j] for j in [0, 2, 4, 6]]
-                        ys = [coords[j] for j in [1, 3, 5, 7]]
-                        info["min_x"] = min(xs)
-                        info["max_x"] = max(xs)
-                        info["min_y"] = min(ys)
-                        info["max_y"] = max(ys)
-                        # self.log_signal.emit(f"Line {line_num + 1}: Detected object bbox via POLYGON: X[{info['min_x']:.4f}:{info['max_x']:.4f}] Y[{info['min_y']:.4f}:{info['max_y']:.4f}]", "debug") # Removed verbose debug
-                    except ValueError:
-                        self.log_signal.emit(f"Line {line_num + 1}: Error parsing POLYGON coordinates.", "debug")
-                        pass
-
-            if info["min_x"] is None: 
-                bbox_match = re.search(r"X\[([-+]?\d*\.?\d+):([-+]?\d*\.?\d+)\]\s*Y\[([-+]?\d*\.?\d+):([-+]?\d*\.?\d+)\](?:\s*Z\[([-+]?\d*\.?\d+):([-+]?\d*\.?\d+)\])?", line, re.IGNORECASE)
-                if bbox_match:
-                    try:
-                        info["min_x"] = float(bbox_match.group(1))
-                        info["max_x"] = float(bbox_match.group(2))
-                        info["min_y"] = float(bbox_match.group(3))
-                        info["max_y"] = float(bbox_match.group(4)) 
-                        if bbox_match.group(5) and bbox_match.group(6):
-                            info["max_z"] = float(bbox_match.group(6)) 
-                        # self.log_signal.emit(f"Line {line_num + 1}: Detected object bbox: X[{info['min_x']:.4f}:{info['max_x']:.4f}] Y[{info['min_y']:.4f}:{info['max_y']:.4f}] Z[{info.get('min_z', 'N/A')}:{info.get('max_z', 'N/A')}]", "debug") # Removed verbose debug
-                    except ValueError: 
-                        self.log_signal.emit(f"Line {line_num + 1}: Error parsing bbox coordinates.", "debug")
-                        pass
-            
-            # Max Z height
-            if info["max_z"] is None: 
-                max_z_match = re.search(r"(?:max_z_height|max_z)\s*[=:]\s*([-+]?\d*\.?\d+)", line, re.IGNORECASE) 
-                if max_z_match: 
-                    try:
-                        info["max_z"] = float(max_z_match.group(1))
-                        # self.log_signal.emit(f"Line {line_num + 1}: Detected max_z: {info['max_z']}", "debug") # Removed verbose debug
-                    except ValueError:
-                        self.log_signal.emit(f"Line {line_num + 1}: Error parsing max_z value.", "debug")
-                        pass
+            if info["gcode_flavor"] is None and g["flavor"]:
+                flavor = g["flavor"].lower()
+                if flavor in ["klipper", "marlin"]:
+                    info["gcode_flavor"] = flavor
+
+            # Total layers (three comment dialects)
+            elif info["total_layers"] is None and g["layers_total"]:
+                info["total_layers"] = int(g["layers_total"])
+            elif info["total_layers"] is None and g["layers"]:
+                info["total_layers"] = int(g["layers"])
+            elif info["total_layers"] is None and g["max_layer"]:
+                info["total_layers"] = int(g["max_layer"]) + 1
+
+            # Object Bounding Box (comment-based; POLYGON= takes priority,
+            # can be overridden by toolpath later)
+            elif info["min_x"] is None and g["poly_x1"]:
+                try:
+                    coords = [float(g[f"poly_{axis}{i}"]) for i in range(1, 5) for axis in ("x", "y")]
+                    xs = coords[0::2]
+                    ys = coords[1::2]
+                    info["min_x"] = min(xs)
+                    info["max_x"] = max(xs)
+                    info["min_y"] = min(ys)
+                    info["max_y"] = max(ys)
+                except ValueError:
+                    self._dlog(f"Line {line_num + 1}: Error parsing POLYGON coordinates.")
+            elif info["min_x"] is None and g["bbox_x1"]:
+                try:
+                    info["min_x"] = float(g["bbox_x1"])
+                    info["max_x"] = float(g["bbox_x2"])
+                    info["min_y"] = float(g["bbox_y1"])
+                    info["max_y"] = float(g["bbox_y2"])
+                    if g["bbox_z1"] and g["bbox_z2"]:
+                        info["max_z"] = float(g["bbox_z2"])
+                except ValueError:
+                    self._dlog(f"Line {line_num + 1}: Error parsing bbox coordinates.")
 
+            # Max Z height
+            elif info["max_z"] is None and g["maxz"]:
+                try:
+                    info["max_z"] = float(g["maxz"])
+                except ValueError:
+                    self._dlog(f"Line {line_num + 1}: Error parsing max_z value.")
 
             # --- Bed Dimension Parsing and Immediate Validation ---
-            if info["bed_dimensions"] is None:
-                x_dim, y_dim = None, None
-                
-                # Combined regex for common bed dimension comments
-                bed_dim_match = re.search(r"(?:bed_size|print_bed_size|bed_shape)\s*[=:]\s*(\S+?)(?:x|,\s*)(\S+)", line, re.IGNORECASE)
-                
-                if bed_dim_match:
-                    try:
-                        x_str = bed_dim_match.group(1).replace(",", "") # Remove comma if present
-                        y_str = bed_dim_match.group(2).replace(",", "")
-                        
-                        x_dim = float(x_str)
-                        y_dim = float(y_str)
-
-                        # Immediate sanity check
-                        if x_dim < MIN_BED_DIMENSION or y_dim < MIN_BED_DIMENSION:
-                            self.log_signal.emit(f"WARNING: Line {line_num + 1}: Detected bed dimensions X:{x_dim:.1f}, Y:{y_dim:.1f} which are too small. Defaulting to {DEFAULT_BED_X}x{DEFAULT_BED_Y}mm.", "warning")
-                            x_dim = DEFAULT_BED_X
-                            y_dim = DEFAULT_BED_Y
-                        
-                        info["bed_dimensions"] = {"x": x_dim, "y": y_dim}
-                        # self.log_signal.emit(f"Line {line_num + 1}: Final bed dimensions set to: {info['bed_dimensions']['x']}x{info['bed_dimensions']['y']}", "debug") # Removed verbose debug
-
-                    except ValueError:
-                        self.log_signal.emit(f"Line {line_num + 1}: Error parsing bed dimensions from '{line.strip()}'.", "debug")
-                        pass
-                
-                # NEW: Parse 'printable_area' comment format
-                if info["bed_dimensions"] is None:
-                    # Regex to capture the maxX and maxY from the pattern like '0x0,220x0,220x220,0x220'
-                    printable_area_match = re.search(r";\s*printable_area\s*=\s*[-\d.]+x[-\d.]+,\s*[-\d.]+x[-\d.]+,\s*([-\d.]+)x([-\d.]+),", line, re.IGNORECASE)
-                    if printable_area_match:
-                        try:
-                            # Group 1 is maxX, Group 2 is maxY from 'maxX x maxY,' part
-                            x_dim = float(printable_area_match.group(1))
-                            y_dim = float(printable_area_match.group(2))
-
-                            # Immediate sanity check
-                            if x_dim < MIN_BED_DIMENSION or y_dim < MIN_BED_DIMENSION:
-                                self.log_signal.emit(f"WARNING: Line {line_num + 1}: Detected printable_area dimensions X:{x_dim:.1f}, Y:{y_dim:.1f} which are too small. Defaulting to {DEFAULT_BED_X}x{DEFAULT_BED_Y}mm.", "warning")
-                                x_dim = DEFAULT_BED_X
-                                y_dim = DEFAULT_BED_Y
-                            
-                            info["bed_dimensions"] = {"x": x_dim, "y": y_dim}
-                            # self.log_signal.emit(f"Line {line_num + 1}: Final bed dimensions set from printable_area: {info['bed_dimensions']['x']}x{info['bed_dimensions']['y']}", "debug") # Removed verbose debug
-                        except ValueError:
-                            self.log_signal.emit(f"Line {line_num + 1}: Error parsing printable_area dimensions from '{line.strip()}'.", "debug")
-                            pass
-            
-            # --- Early Exit Optimization ---
-            # If all crucial info (including valid bed dimensions) is found, break early.
-            if all(info[k] is not None for k in ["total_layers", "min_x", "max_x", "min_y", "max_y", "max_z", "gcode_flavor"]):
-                if info["bed_dimensions"] is not None and \
-                   info["bed_dimensions"]["x"] >= MIN_BED_DIMENSION and info["bed_dimensions"]["y"] >= MIN_BED_DIMENSION:
-                    # self.log_signal.emit(f"All primary info (layers, bbox, flavor, valid bed) found. Stopping parsing early.", "debug") # Removed verbose debug
-                    break 
-                
+            elif info["bed_dimensions"] is None and g["bed_x"]:
+                try:
+                    x_dim = float(g["bed_x"].replace(",", "")) # Remove comma if present
+                    y_dim = float(g["bed_y"].replace(",", ""))
+
+                    # Immediate sanity check
+                    if x_dim < MIN_BED_DIMENSION or y_dim < MIN_BED_DIMENSION:
+                        self.log_signal.emit(f"WARNING: Line {line_num + 1}: Detected bed dimensions X:{x_dim:.1f}, Y:{y_dim:.1f} which are too small. Defaulting to {DEFAULT_BED_X}x{DEFAULT_BED_Y}mm.", "warning")
+                        x_dim = DEFAULT_BED_X
+                        y_dim = DEFAULT_BED_Y
+
+                    info["bed_dimensions"] = {"x": x_dim, "y": y_dim}
+                except ValueError:
+                    self._dlog(f"Line {line_num + 1}: Error parsing bed dimensions from '{line}'.")
+            elif info["bed_dimensions"] is None and g["pa_x"]:
+                try:
+                    x_dim = float(g["pa_x"])
+                    y_dim = float(g["pa_y"])
+
+                    # Immediate sanity check
+                    if x_dim < MIN_BED_DIMENSION or y_dim < MIN_BED_DIMENSION:
+                        self.log_signal.emit(f"WARNING: Line {line_num + 1}: Detected printable_area dimensions X:{x_dim:.1f}, Y:{y_dim:.1f} which are too small. Defaulting to {DEFAULT_BED_X}x{DEFAULT_BED_Y}mm.", "warning")
+                        x_dim = DEFAULT_BED_X
+                        y_dim = DEFAULT_BED_Y
+
+                    info["bed_dimensions"] = {"x": x_dim, "y": y_dim}
+                except ValueError:
+                    self._dlog(f"Line {line_num + 1}: Error parsing printable_area dimensions from '{line}'.")
+
+        # Report completion once all crucial info (including valid bed
+        # dimensions) has been found, so the caller stops calling us.
+        if all(info[k] is not None for k in ["total_layers", "min_x", "max_x", "min_y", "max_y", "max_z", "gcode_flavor"]):
+            if info["bed_dimensions"] is not None and \
+               info["bed_dimensions"]["x"] >= MIN_BED_DIMENSION and info["bed_dimensions"]["y"] >= MIN_BED_DIMENSION:
+                return True
+            # Everything except the bed dimensions is known. Some slicers
+            # never emit bed-size comments at all, so rather than scanning
+            # the whole file for them, allow a bounded number of extra
+            # lines and then give up — _finalize_gcode_info falls back to
+            # the default bed size.
+            if self._bed_scan_deadline is None:
+                self._bed_scan_deadline = line_num + BED_INFO_SCAN_EXTRA_LINES
+            elif line_num > self._bed_scan_deadline:
+                return True
+        return False
+
+
+    def _finalize_gcode_info(self, info):
+        """
+        Applies post-parse fallbacks to the collected header info (bed
+        dimension defaults) after the fused pass has consumed the file.
+        """
         # Final fallback for bed dimensions if not found or still invalid after loop
         if info["bed_dimensions"] is None or \
            info["bed_dimensions"]["x"] < MIN_BED_DIMENSION or info["bed_dimensions"]["y"] < MIN_BED_DIMENSION:
@@ -357,126 +533,241 @@ class GCodeParseThread(QThread):
             self.log_signal.emit(f"WARNING: Bed dimensions were not reliably detected from G-code (found X:{old_x}, Y:{old_y}). Defaulting to {DEFAULT_BED_X}x{DEFAULT_BED_Y}mm for robustness.", "warning")
 
 
-        self.log_signal.emit(f"Finished G-code info parsing. Final detected info: {info}", "debug")
+        self._dlog(f"Finished G-code info parsing. Final detected info: {info}")
         return info
+    def _new_gcode_info(self):
+        """
+        Returns a fresh header-info dict with every field unset.
+        """
+        return {
+            "total_layers": None, "gcode_flavor": None,
+            "min_x": None, "max_x": None,
+            "min_y": None, "max_y": None,
+            "max_z": None,
+            "bed_dimensions": None
+        }
 
-    def _parse_gcode_toolpath(self, lines):
+    def _scan_header_info(self):
         """
-        Parses G-code lines to extract a list of (x, y, z) coordinates
-        representing the toolpath.
-        Returns a list of tuples: [(QPointF(x, y), z_value), ...].
-        Handles G90 (absolute) and G91 (relative) positioning.
-        Additionally, identifies potential layer start points for snapshots.
-        
-        MODIFIED: Also returns the min/max X/Y/Z bounds derived from the actual toolpath.
+        Runs the header-info patterns over bounded slices of the file:
+        the first HEADER_SCAN_BYTES, then (if fields are still missing)
+        the last FOOTER_SCAN_BYTES, where some slicers put their settings
+        block. Keeps header parsing at tens of milliseconds regardless of
+        file size, and lets the full streaming pass skip it entirely when
+        everything was found here.
+        Returns (info, info_done).
+        """
+        info = self._new_gcode_info()
+        info_done = False
+        self._bed_scan_deadline = None
+
+        with open(self.filepath, "rb") as f:
+            head = f.read(HEADER_SCAN_BYTES)
+            f.seek(0, os.SEEK_END)
+            size = f.tell()
+            if size > HEADER_SCAN_BYTES:
+                # Tail slice, clamped so it never re-reads head bytes.
+                f.seek(max(HEADER_SCAN_BYTES, size - FOOTER_SCAN_BYTES))
+                tail = f.read()
+            else:
+                tail = b""
+
+        for chunk in (head, tail):
+            if info_done:
+                break
+            for line_num, line in enumerate(chunk.decode("utf-8", errors="replace").splitlines()):
+                info_done = self._parse_info_line(line.strip().upper(), line_num, info)
+                if info_done:
+                    break
+
+        return info, info_done
+
+    def _parse_gcode(self, lines, info=None, info_done=False):
+        """
+        Single-pass parser combining the old info and toolpath scans.
+        Accepts any iterable of lines (typically the open file object) and
+        consumes it once, one line at a time: header-info patterns run via
+        _parse_info_line until all fields are found (usually already done
+        by the bounded _scan_header_info pre-scan), while toolpath
+        extraction covers the whole file.
+        Handles G90 (absolute) and G91 (relative) positioning and
+        identifies potential layer start points for snapshots.
+        Returns (info, toolpath_points, layer_start_points, toolpath_bounds)
+        where toolpath_points is a contiguous (N, 3) float32 ndarray of
+        x, y, z rows (the viewer consumes it directly).
         """
-        toolpath_points = [] # Stores (QPointF(x,y), z) tuples
+        if info is None:
+            info = self._new_gcode_info()
+            self._bed_scan_deadline = None
+
+        coords = [] # Flat x, y, z float list, packed into an ndarray at the end
         layer_start_points = [] # Stores (QPointF(x,y), z) tuples for layer starts
-        
-        current_x, current_y, current_z = 0.0, 0.0, 0.0 
+
+        current_x, current_y, current_z = 0.0, 0.0, 0.0
+        # Last accepted position for the dedup check — plain floats, no
+        # per-line QPointF/tuple construction just to compare.
+        last_x = last_y = last_z = None
         is_relative = False # Start assuming absolute unless G91 is encountered
         current_layer = -1 # Track the current layer
         layer_change_detected = False # Flag to mark if a new layer comment was just seen
 
-        # Track overall min/max for the entire toolpath
-        min_x_path, max_x_path = float('inf'), float('-inf')
-        min_y_path, max_y_path = float('inf'), float('-inf')
-        min_z_path, max_z_path = float('inf'), float('-inf')
+        self._dlog("Starting single-pass G-code parsing...")
 
+        # Bind the hot pattern methods to locals: the loop body runs once
+        # per line, and local lookups skip the per-iteration attribute
+        # resolution on the module-level pattern objects.
+        move_match = GCODE_MOVE_PATTERN.match
+        layer_search = LAYER_COMMENT_PATTERN.search
 
-        # Regex to find G0/G1 commands and extract X, Y, Z, E values
-        gcode_move_pattern = re.compile(r"^(G0|G1)\s*(?:X([-\d.]+))?\s*(?:Y([-\d.]+))?\s*(?:Z([-\d.]+))?\s*(?:E([-\d.]+))?.*$")
-
-        self.log_signal.emit("Starting G-code toolpath parsing...", "debug")
-        
         for line_num, line in enumerate(lines):
-            line = line.strip() 
-            line_upper = line.upper()
+            line = line.strip()
+
+            # Dispatch on the first character before running any pattern:
+            # the file is overwhelmingly G moves, so comment-only work
+            # (header info, layer comments) and move-only work never see
+            # each other's lines.
+            first_char = line[:1]
+
+            if first_char == ';':
+                # Comment line: header info (until complete) and layer
+                # change comments (e.g., from PrusaSlicer, Cura). One
+                # .upper() feeds both case-normalized patterns.
+                line_upper = line.upper()
+                if not info_done:
+                    info_done = self._parse_info_line(line_upper, line_num, info)
+                layer_match = layer_search(line_upper)
+                if layer_match:
+                    new_layer = int(layer_match.group(1))
+                    if new_layer > current_layer:
+                        current_layer = new_layer
+                        layer_change_detected = True
+                        # self.log_signal.emit(f"Line {line_num + 1}: Detected new layer comment: {current_layer}", "debug") # Removed verbose debug
+                continue # Comment lines carry no moves
+
+            if first_char not in ('G', 'g'):
+                # Header info can also appear on non-comment lines (e.g.
+                # EXCLUDE_OBJECT_DEFINE ... POLYGON=...), so feed those to
+                # the info patterns while the header is still incomplete.
+                if not info_done:
+                    info_done = self._parse_info_line(line.upper(), line_num, info)
+                continue
 
             # Check for G90/G91 directly
+            line_upper = line.upper()
             if line_upper.startswith("G90"):
                 is_relative = False
-                continue 
+                continue
             elif line_upper.startswith("G91"):
                 is_relative = True
-                continue 
-            
-            # Check for layer change comments (e.g., from PrusaSlicer, Cura)
-            layer_match = re.search(r";LAYER:(\d+)", line_upper)
-            if layer_match:
-                new_layer = int(layer_match.group(1))
-                if new_layer > current_layer:
-                    current_layer = new_layer
-                    layer_change_detected = True
-                    # self.log_signal.emit(f"Line {line_num + 1}: Detected new layer comment: {current_layer}", "debug") # Removed verbose debug
-                continue # Process next line, expecting a move command soon
-
-            # Check for move commands (G0 or G1)
-            match = gcode_move_pattern.match(line)
-            if match:
-                x_str, y_str, z_str, e_str = match.group(2), match.group(3), match.group(4), match.group(5)
-                
+                continue
+
+            # Tokenize move commands (G0/G1) with str.split and first-char
+            # dispatch instead of the regex: the dominant "G1 X.. Y.. E.."
+            # lines parse several times faster and misses allocate no Match
+            # object. The regex stays as a fallback for compact (no-space)
+            # or malformed move lines.
+            move_vals = None
+            tokens = line.split()
+            cmd = tokens[0] if tokens else ""
+            if cmd in ('G0', 'G1'):
+                try:
+                    x_val = y_val = z_val = None
+                    e_present = False
+                    for token in tokens[1:]:
+                        c = token[0]
+                        if c == ';':
+                            break # Inline comment: rest of the line is not G-code
+                        if c == 'X':
+                            x_val = float(token[1:])
+                        elif c == 'Y':
+                            y_val = float(token[1:])
+                        elif c == 'Z':
+                            z_val = float(token[1:])
+                        elif c == 'E':
+                            e_present = bool(token[1:])
+                    move_vals = (x_val, y_val, z_val, e_present)
+                except ValueError:
+                    move_vals = None # Malformed token: retry with the regex
+            if move_vals is None and cmd[:2] in ('G0', 'G1'):
+                match = move_match(line)
+                if match:
+                    x_str, y_str, z_str, e_str = match.group(2), match.group(3), match.group(4), match.group(5)
+                    move_vals = (float(x_str) if x_str is not None else None,
+                                 float(y_str) if y_str is not None else None,
+                                 float(z_str) if z_str is not None else None,
+                                 e_str is not None)
+
+            if move_vals is not None:
+                x_val, y_val, z_val, e_present = move_vals
+
                 prev_x, prev_y, prev_z = current_x, current_y, current_z
 
                 # Determine new position based on absolute/relative mode
-                if x_str is not None:
-                    x_val = float(x_str)
+                if x_val is not None:
                     current_x = prev_x + x_val if is_relative else x_val
-                
-                if y_str is not None:
-                    y_val = float(y_str)
+
+                if y_val is not None:
                     current_y = prev_y + y_val if is_relative else y_val
-                
-                if z_str is not None:
-                    z_val = float(z_str)
-                    current_z = prev_z + z_val if is_relative else z_val
-                
-                # Add the point if it's a new unique (X,Y,Z) position
-                if not toolpath_points or (QPointF(current_x, current_y), current_z) != toolpath_points[-1]:
-                    toolpath_points.append((QPointF(current_x, current_y), current_z))
 
-                    # Update overall path bounds using the current position
-                    min_x_path = min(min_x_path, current_x)
-                    max_x_path = max(max_x_path, current_x)
-                    min_y_path = min(min_y_path, current_y)
-                    max_y_path = max(max_y_path, current_y)
-                    min_z_path = min(min_z_path, current_z)
-                    max_z_path = max(max_z_path, current_z)
+                if z_val is not None:
+                    current_z = prev_z + z_val if is_relative else z_val
 
+                # Add the point if it's a new unique (X,Y,Z) position
+                if current_x != last_x or current_y != last_y or current_z != last_z:
+                    coords.append(current_x)
+                    coords.append(current_y)
+                    coords.append(current_z)
+                    last_x, last_y, last_z = current_x, current_y, current_z
 
                     # If a layer change was just detected AND this is a printing move (E present)
                     # or it's the first move after the layer comment, add it as a snapshot point.
                     # We also add a point if current Z is significantly higher than previous Z
                     # AND it's not a retract/unretract (i.e. E-value is not present or 0)
-                    if layer_change_detected and (e_str is not None or current_z > prev_z + 0.05): # Use a small tolerance for Z change
+                    if layer_change_detected and (e_present or current_z > prev_z + 0.05): # Use a small tolerance for Z change
                         layer_start_points.append((QPointF(current_x, current_y), current_z))
                         # self.log_signal.emit(f"Line {line_num + 1}: Added layer start point: ({current_x:.1f}, {current_y:.1f}, Z={current_z:.1f}) for layer {current_layer}", "debug") # Removed verbose debug
                         layer_change_detected = False # Reset flag after adding the point
 
-        self.log_signal.emit(f"Finished G-code toolpath parsing. Parsed {len(toolpath_points)} toolpath points for preview, including Z coordinates.", "debug")
+        # Pack the accepted positions into one contiguous (N, 3) float32
+        # array — a fraction of the memory of per-point QPointF/tuple
+        # objects, and exactly what the viewer stores internally.
+        toolpath_points = np.array(coords, dtype=np.float32).reshape(-1, 3)
+        del coords
+
+        self._dlog(f"Finished G-code parsing. Parsed {len(toolpath_points)} toolpath points for preview, including Z coordinates.")
         # self.log_signal.emit(f"Detected {len(layer_start_points)} potential layer start points for snapshots.", "debug") # Removed verbose debug
 
-        # Handle cases where no moves were found (min/max remain inf)
-        if min_x_path == float('inf'): # No moves, set reasonable defaults for an empty path
+        # Overall path bounds in one vectorized pass (defaults when no
+        # moves were found).
+        if len(toolpath_points):
+            mins = toolpath_points.min(axis=0)
+            maxs = toolpath_points.max(axis=0)
+            min_x_path, min_y_path, min_z_path = (float(v) for v in mins)
+            max_x_path, max_y_path, max_z_path = (float(v) for v in maxs)
+        else:
             min_x_path, max_x_path = 0.0, 0.0
             min_y_path, max_y_path = 0.0, 0.0
             min_z_path, max_z_path = 0.0, 0.0
-        
+
         # Consolidate toolpath bounds into a dictionary
         toolpath_bounds = {
             "min_x_path": min_x_path,
             "max_x_path": max_x_path,
             "min_y_path": min_y_path,
             "max_y_path": max_y_path,
-            "min_z_path": min_z_path, 
+            "min_z_path": min_z_path,
             "max_z_path": max_z_path
         }
-        self.log_signal.emit(f"Calculated toolpath bounds: {toolpath_bounds}", "debug")
+        self._dlog(f"Calculated toolpath bounds: {toolpath_bounds}")
 
-        if not toolpath_points:
+        if not len(toolpath_points):
             self.log_signal.emit("Warning: No X/Y movement commands found or parsed in the G-code for the preview.", "warning")
-        
-        return toolpath_points, layer_start_points, toolpath_bounds # Return the new bounds
+
+        # Apply the info fallbacks (default bed dimensions) now that the
+        # whole file has been seen.
+        info = self._finalize_gcode_info(info)
+
+        return info, toolpath_points, layer_start_points, toolpath_bounds # Return the new bounds
 
 
 class PrintPathApp(QMainWindow):
@@ -490,9 +781,13 @@ class PrintPathApp(QMainWindow):
         self.setGeometry(100, 100, 1000, 700)
 
         self.processed_gcode_content = None
-        self.original_gcode_filepath = None 
+        self.original_gcode_filepath = None
+        # Basename of the loaded file, split out once when the path is
+        # assigned so log messages and filename derivations don't re-split
+        # the same path on every slot invocation.
+        self.original_gcode_basename = None
         self.gcode_bed_dimensions = None 
-        self.gcode_toolpath_data = None # Now stores list of (QPointF, float) tuples
+        self.gcode_toolpath_data = None # (N, 3) float32 ndarray once a file is parsed
         self.gcode_layer_start_points = [] # New: Stores (QPointF, float) tuples for layer start points (pre-processing)
         self.processed_snapshot_points = [] # Moved to GCodeViewer, but reset here for clarity.
         self.gcode_info_full_data = {} # New: to store all parsed info including total_layers
@@ -527,6 +822,15 @@ class PrintPathApp(QMainWindow):
         self.global_setting_widgets = {} 
         self.script_specific_setting_widgets = {}
         self.dynamic_setting_rows = [] 
+        # Last (script, total_layers, parsing) combination the settings
+        # panel was built for; lets _update_settings_panel_visibility
+        # skip redundant rebuilds.
+        self._panel_render_key = None
+        # LRU cache of raw parse results keyed by (abspath, mtime, size),
+        # and the key of the parse currently in flight (stored when the
+        # thread starts, consumed when its result arrives).
+        self._parse_cache = OrderedDict()
+        self._pending_parse_key = None
 
         # --- GLOBAL Settings UI Elements (created once) ---
         self.firmware_label = QLabel("Firmware:")
@@ -534,7 +838,7 @@ class PrintPathApp(QMainWindow):
         self.firmware_input.addItem("klipper")
         self.firmware_input.addItem("marlin")
         self.firmware_input.setCurrentText(self.current_settings.get("firmware", self.global_default_settings.get("firmware", "klipper")))
-        self.firmware_input.currentTextChanged.connect(lambda text: self._update_setting("firmware", text))
+        self.firmware_input.currentTextChanged.connect(partial(self._update_setting, "firmware"))
         self.firmware_input.setToolTip("Select the firmware your 3D printer uses (e.g., Klipper, Marlin).")
         self.settings_form_layout.addRow(self.firmware_label, self.firmware_input)
         self.global_setting_widgets["firmware"] = (self.firmware_label, self.firmware_input)
@@ -544,7 +848,7 @@ class PrintPathApp(QMainWindow):
         self.travel_speed_input.setRange(1000, 30000)
         self.travel_speed_input.setSingleStep(100)
         self.travel_speed_input.setValue(self.current_settings.get("travel_speed", self.global_default_settings.get("travel_speed", 2500)))
-        self.travel_speed_input.valueChanged.connect(lambda value: self._update_setting("travel_speed", value))
+        self.travel_speed_input.valueChanged.connect(partial(self._update_setting, "travel_speed"))
         self.travel_speed_input.setToolTip("The speed at which the nozzle travels during non-printing moves for snapshots.")
         self.settings_form_layout.addRow(self.travel_speed_label, self.travel_speed_input)
         self.global_setting_widgets["travel_speed"] = (self.travel_speed_label, self.travel_speed_input) 
@@ -554,7 +858,7 @@ class PrintPathApp(QMainWindow):
         self.dwell_time_input.setRange(0, 5000)
         self.dwell_time_input.setSingleStep(50)
         self.dwell_time_input.setValue(self.current_settings.get("dwell_time", self.global_default_settings.get("dwell_time", 500)))
-        self.dwell_time_input.valueChanged.connect(lambda value: self._update_setting("dwell_time", value))
+        self.dwell_time_input.valueChanged.connect(partial(self._update_setting, "dwell_time"))
         self.dwell_time_input.setToolTip("The duration (in milliseconds) the printer waits at the snapshot position.")
         self.settings_form_layout.addRow(self.dwell_time_label, self.dwell_time_input) 
         self.global_setting_widgets["dwell_time"] = (self.dwell_time_label, self.dwell_time_input)
@@ -564,7 +868,7 @@ class PrintPathApp(QMainWindow):
         self.retract_length_input.setRange(0.0, 10.0)
         self.retract_length_input.setSingleStep(0.1)
         self.retract_length_input.setValue(self.current_settings.get("retract_length", self.global_default_settings.get("retract_length", 0.5)))
-        self.retract_length_input.valueChanged.connect(lambda value: self._update_setting("retract_length", value))
+        self.retract_length_input.valueChanged.connect(partial(self._update_setting, "retract_length"))
         self.retract_length_input.setToolTip("The amount of filament to retract before a travel move to prevent oozing.")
         self.settings_form_layout.addRow(self.retract_length_label, self.retract_length_input)
         self.global_setting_widgets["retract_length"] = (self.retract_length_label, self.retract_length_input)
@@ -574,7 +878,7 @@ class PrintPathApp(QMainWindow):
         self.retract_speed_input.setRange(1, 200)
         self.retract_speed_input.setSingleStep(5)
         self.retract_speed_input.setValue(self.current_settings.get("retract_speed", self.global_default_settings.get("retract_speed", 40)))
-        self.retract_speed_input.valueChanged.connect(lambda value: self._update_setting("retract_speed", value))
+        self.retract_speed_input.valueChanged.connect(partial(self._update_setting, "retract_speed"))
         self.retract_speed_input.setToolTip("The speed at which filament is retracted and unretracted.")
         self.settings_form_layout.addRow(self.retract_speed_label, self.retract_speed_input)
         self.global_setting_widgets["retract_speed"] = (self.retract_speed_label, self.retract_speed_input)
@@ -584,7 +888,7 @@ class PrintPathApp(QMainWindow):
         self.z_hop_height_input.setRange(0.0, 5.0)
         self.z_hop_height_input.setSingleStep(0.05)
         self.z_hop_height_input.setValue(self.current_settings.get("z_hop_height", self.global_default_settings.get("z_hop_height", 0.5)))
-        self.z_hop_height_input.valueChanged.connect(lambda value: self._update_setting("z_hop_height", value))
+        self.z_hop_height_input.valueChanged.connect(partial(self._update_setting, "z_hop_height"))
         self.z_hop_height_input.setToolTip("The vertical distance the nozzle lifts during travel moves for snapshots.")
         self.settings_form_layout.addRow(self.z_hop_height_label, self.z_hop_height_input)
         self.global_setting_widgets["z_hop_height"] = (self.z_hop_height_label, self.z_hop_height_input)
@@ -604,25 +908,47 @@ class PrintPathApp(QMainWindow):
 
         # Initialize GCodeViewer with default bed dimensions and an empty toolpath
         # This ensures the viewer always has a valid drawing context.
-        self.gcode_viewer.set_bed_dimensions(DEFAULT_BED_X, DEFAULT_BED_Y, 250.0) # Assume 250 max Z
-        self.gcode_viewer.set_gcode_data([]) # Start with empty toolpath
-        self.gcode_viewer.set_layer_start_points([]) # Initialize empty layer start points
-        self.gcode_viewer.set_processed_snapshot_points([]) # Initialize empty processed snapshot points
+        # The window isn't shown yet, so don't let these initial setters
+        # queue paint events; one batch covers all four.
+        self.gcode_viewer.setUpdatesEnabled(False)
+        try:
+            self.gcode_viewer.set_bed_dimensions(DEFAULT_BED_X, DEFAULT_BED_Y, 250.0) # Assume 250 max Z
+            self.gcode_viewer.set_gcode_data([]) # Start with empty toolpath
+            self.gcode_viewer.set_layer_start_points([]) # Initialize empty layer start points
+            self.gcode_viewer.set_processed_snapshot_points([]) # Initialize empty processed snapshot points
+        finally:
+            self.gcode_viewer.setUpdatesEnabled(True)
 
 
-        self.log_console = QTextEdit()
+        # QPlainTextEdit instead of QTextEdit: the console is an
+        # append-only log viewer, and QPlainTextEdit is built for that
+        # (near-constant append cost vs. QTextEdit's full rich-text
+        # document growing more expensive as lines accumulate).
+        self.log_console = QPlainTextEdit()
         self.log_console.setReadOnly(True)
-        self.log_formats = {
-            "info": QTextCharFormat(),
-            "warning": QTextCharFormat(),
-            "error": QTextCharFormat(),
-            "debug": QTextCharFormat()
+        # Bound the document so a spammy script can't grow it without
+        # limit; Qt recycles the oldest blocks automatically, keeping
+        # append cost and memory constant over long sessions.
+        self.log_console.setMaximumBlockCount(MAXIMUM_LOG_BLOCKS)
+        # Pre-built opening span per message type, so the batched flush
+        # concatenates constants instead of re-formatting color styles
+        # for every line.
+        self._log_html_open = {
+            "info": '<span style="color:#CCCCCC">',
+            "warning": '<span style="color:#FFA500">',
+            "error": '<span style="color:#FF0000">',
+            "debug": '<span style="color:#808080">'
         }
-        self.log_formats["info"].setForeground(QColor("#CCCCCC"))    
-        self.log_formats["warning"].setForeground(QColor("#FFA500")) 
-        self.log_formats["error"].setForeground(QColor("#FF0000"))   
-        self.log_formats["debug"].setForeground(QColor("#808080"))   
-        
+        # Buffer of pending (message, msg_type) pairs and the single-shot
+        # timer that flushes them: bursty logging from worker threads
+        # costs one document append per interval instead of one per line.
+        self._log_buffer = []
+        self._log_flush_timer = QTimer(self)
+        self._log_flush_timer.setSingleShot(True)
+        self._log_flush_timer.setInterval(LOG_FLUSH_INTERVAL_MS)
+        self._log_flush_timer.timeout.connect(self._flush_log_buffer)
+
+
         # New: Clear Log button
         self.clear_log_button = QPushButton("Clear Log")
         self.clear_log_button.clicked.connect(self._clear_log_console)
@@ -630,9 +956,10 @@ class PrintPathApp(QMainWindow):
         # --- View Mode Selector ---
         self.view_mode_label = QLabel("Preview View:")
         self.view_mode_combo = QComboBox()
-        self.view_mode_combo.addItem("Top View (XY)")
-        self.view_mode_combo.addItem("Front View (XZ)")
-        self.view_mode_combo.setCurrentText(self.current_settings.get("preview_view_mode", "Top View (XY)))"))
+        self.view_mode_combo.addItems(VIEW_MODES)
+        saved_view_mode = self.current_settings.get("preview_view_mode")
+        self.view_mode_combo.setCurrentIndex(
+            VIEW_MODES.index(saved_view_mode) if saved_view_mode in VIEW_MODES else 0)
         self.view_mode_combo.currentTextChanged.connect(self._update_view_mode)
         self.view_mode_combo.setToolTip("Select the perspective for the G-code preview.")
         
@@ -703,7 +1030,9 @@ class PrintPathApp(QMainWindow):
 
 
         last_used_script = self.current_settings.get("last_used_script")
-        if last_used_script and last_used_script in [self.script_combo.itemText(i) for i in range(self.script_combo.count())]:
+        # findText is one Qt call, instead of materializing every item
+        # text through the bridge just for a membership test.
+        if last_used_script and self.script_combo.findText(last_used_script) != -1:
             self.script_combo.setCurrentText(last_used_script)
             self._update_settings_panel_visibility() 
         elif self.script_combo.count() > 0:
@@ -718,26 +1047,44 @@ class PrintPathApp(QMainWindow):
     def _log_message(self, message, msg_type="info"):
         """
         Logs messages to the console with color-coding, conditionally showing debug messages.
-        This function now ONLY updates the GUI QTextEdit, as console output is handled by StreamRedirect.
+        This function now ONLY updates the GUI log console, as console output is handled by StreamRedirect.
         """
         if msg_type == "debug" and not self.current_settings.get("debug_mode", False):
             # Only return if it's a debug message AND debug mode is off
-            return 
-        
-        cursor = self.log_console.textCursor()
-        cursor.movePosition(QTextCursor.End)
-        # Ensure message has a newline if it doesn't already, for proper display
-        if not message.endswith('\n'):
-            message += '\n'
-        cursor.insertBlock() 
-        cursor.insertText(message, self.log_formats.get(msg_type, self.log_formats["info"]))
-        self.log_console.setTextCursor(cursor)
-        self.log_console.ensureCursorVisible()
+            return
+
+        # Buffer the message; the flush timer coalesces a burst of calls
+        # into a single console append. _log_message always runs on the
+        # GUI thread (worker log_signals arrive via queued connections),
+        # so no locking is needed around the buffer.
+        self._log_buffer.append((message, msg_type))
+        if not self._log_flush_timer.isActive():
+            self._log_flush_timer.start()
+
+    def _flush_log_buffer(self):
+        """
+        Appends all buffered log messages to the console in one call.
+        QPlainTextEdit keeps the view scrolled to the bottom on its own
+        when it is already there.
+        """
+        if not self._log_buffer:
+            return
+        info_open = self._log_html_open["info"]
+        parts = []
+        for message, msg_type in self._log_buffer:
+            open_span = self._log_html_open.get(msg_type, info_open)
+            # Escape the text and keep embedded newlines (batched debug
+            # flushes arrive as one multi-line message) as line breaks.
+            body = html.escape(message).replace("\n", "<br>")
+            parts.append(open_span + body + "</span>")
+        self._log_buffer.clear()
+        self.log_console.appendHtml("<br>".join(parts))
 
     def _clear_log_console(self):
         """
         Clears the text in the log console.
         """
+        self._log_buffer.clear() # Drop pending messages too
         self.log_console.clear()
         self._log_message("Log cleared.", "info")
 
@@ -832,6 +1179,10 @@ class PrintPathApp(QMainWindow):
         if not os.path.exists(SCRIPTS_DIR):
             os.makedirs(SCRIPTS_DIR)
             self._log_message(f"Created scripts directory: {SCRIPTS_DIR}", "info")
+
+        # Script definitions are about to change; force the next panel
+        # update to rebuild.
+        self._panel_render_key = None
         
         self.script_combo.clear()
         all_global_setting_keys = list(self.global_default_settings.keys())
@@ -843,32 +1194,71 @@ class PrintPathApp(QMainWindow):
 
         found_scripts = False
         
-        script_files = [f for f in os.listdir(SCRIPTS_DIR) if f.endswith(".py")]
+        # os.scandir over listdir: DirEntry carries name, path and a
+        # cached stat, so the per-script mtime below needs no extra
+        # syscall and no os.path.join.
+        with os.scandir(SCRIPTS_DIR) as entries:
+            script_entries = sorted(
+                (e for e in entries if e.is_file() and e.name.endswith(".py")),
+                key=lambda e: e.name)
+        script_files = [e.name for e in script_entries]
         # print(f"DEBUG: Found script files: {script_files}", file=sys.__stdout__) # Removed verbose debug
 
-        for filename in script_files:
+        # mtime-keyed cache of parsed SCRIPT_SETTINGS headers: scripts
+        # unchanged since the last run are satisfied with a stat call
+        # instead of a read + JSON decode.
+        cache_path = os.path.join(SCRIPTS_DIR, SCRIPT_SETTINGS_CACHE_FILE)
+        try:
+            with open(cache_path, "r") as f:
+                settings_cache = json.load(f)
+        except (OSError, ValueError):
+            settings_cache = {}
+        cache_dirty = False
+
+        for entry in script_entries:
+            filename = entry.name
             script_name = filename[:-3]
             self.script_combo.addItem(script_name)
             found_scripts = True
             # print(f"DEBUG: Adding script '{script_name}' to combo box.", file=sys.__stdout__) # Removed verbose debug
 
-            script_path = os.path.join(SCRIPTS_DIR, filename)
+            script_path = entry.path
             current_script_custom_defs = {}
             try:
-                with open(script_path, "r") as f:
-                    for line_num, line in enumerate(f): # Iterate through lines
+                mtime = entry.stat().st_mtime_ns
+                cached = settings_cache.get(filename)
+                if cached and cached[0] == mtime:
+                    # Unmodified since last parse: reuse the cached defs.
+                    current_script_custom_defs = cached[1]
+                else:
+                    with open(script_path, "r") as f:
+                        # Bounded scan: only the head of the file can hold the
+                        # settings marker, so don't decode the whole script.
+                        head = f.read(SCRIPT_SETTINGS_SCAN_BYTES)
+                        head_lines = head.splitlines()
+                        # If the read stopped exactly at the cap, the last
+                        # line may be cut mid-JSON — complete it.
+                        if len(head) == SCRIPT_SETTINGS_SCAN_BYTES and head_lines:
+                            head_lines[-1] += f.readline()
+                    for line_num, line in enumerate(head_lines): # Iterate through head lines
                         stripped_line = line.strip()
                         if stripped_line.startswith("# SCRIPT_SETTINGS:"):
                             json_str = stripped_line[len("# SCRIPT_SETTINGS:"):].strip()
                             try:
                                 current_script_custom_defs = json.loads(json_str)
-                                self._log_message(f"Parsed SCRIPT_SETTINGS for '{script_name}': {current_script_custom_defs}", "debug")
+                                # Gate the format: the defs repr is large,
+                                # and _log_message would discard it anyway
+                                # when debug mode is off.
+                                if self.current_settings.get("debug_mode", False):
+                                    self._log_message(f"Parsed SCRIPT_SETTINGS for '{script_name}': {current_script_custom_defs}", "debug")
                                 # print(f"DEBUG: Parsed SCRIPT_SETTINGS for '{script_name}': {current_script_custom_defs}", file=sys.__stdout__) # Removed verbose debug
                             except json.JSONDecodeError as e:
                                 self._log_message(f"Error parsing SCRIPT_SETTINGS JSON for '{script_name}' on line {line_num + 1}: {e}", "error")
                                 print(f"ERROR: Error parsing SCRIPT_SETTINGS JSON for '{script_name}' on line {line_num + 1}: {e}", file=sys.__stdout__)
                                 current_script_custom_defs = {} 
                             break # Found settings, stop scanning this file
+                    settings_cache[filename] = [mtime, current_script_custom_defs]
+                    cache_dirty = True
                 
                 self.script_global_settings_map[script_name] = all_global_setting_keys
                 self.script_custom_settings_defs_map[script_name] = current_script_custom_defs
@@ -897,6 +1287,20 @@ class PrintPathApp(QMainWindow):
                 self.script_custom_settings_defs_map[script_name] = {}
 
 
+        # Drop cache entries for scripts that no longer exist and persist
+        # any changes atomically (temp file + replace, like save_settings).
+        for stale in [k for k in settings_cache if k not in script_files]:
+            del settings_cache[stale]
+            cache_dirty = True
+        if cache_dirty:
+            try:
+                tmp_path = cache_path + ".tmp"
+                with open(tmp_path, "w") as f:
+                    json.dump(settings_cache, f)
+                os.replace(tmp_path, cache_path)
+            except OSError as e:
+                self._log_message(f"Could not write script settings cache: {e}", "debug")
+
         if not found_scripts:
             self._log_message(f"No scripts found in '{SCRIPTS_DIR}'. Please add .py files.", "warning")
             print(f"WARNING: No scripts found in '{SCRIPTS_DIR}'.", file=sys.__stdout__)
@@ -914,6 +1318,17 @@ class PrintPathApp(QMainWindow):
         selected_script_name = self.script_combo.currentText()
         # print(f"DEBUG: Entering _update_settings_panel_visibility() for script: '{selected_script_name}'", file=sys.__stdout__) # Removed verbose debug
 
+        # Rebuilding the panel tears down and recreates every dynamic
+        # widget and saves the settings file. Skip all of it when nothing
+        # the layout depends on has changed (programmatic re-selection of
+        # the same script is common).
+        render_key = (selected_script_name,
+                      self.gcode_info_full_data.get("total_layers"),
+                      self.progress_bar.isVisible())
+        if render_key == self._panel_render_key:
+            return
+        self._panel_render_key = render_key
+
         if not selected_script_name:
             # print("DEBUG: No script selected. Hiding all settings.", file=sys.__stdout__) # Removed verbose debug
             for setting_key, (label_widget, input_widget) in self.global_setting_widgets.items():
@@ -945,6 +1360,11 @@ class PrintPathApp(QMainWindow):
             self.current_settings[selected_script_name] = {}
         script_current_settings = self.current_settings[selected_script_name]
 
+        # total_layers doesn't change during the rebuild; derive the
+        # layer-based maximum once for every dependent spinbox below.
+        total_layers = self.gcode_info_full_data.get("total_layers")
+        max_from_layers = max(1, total_layers) if total_layers is not None else None
+
         for setting_key, defs in custom_setting_defs.items():
             label_text = defs.get("label", setting_key.replace('_', ' ').title() + ":")
             label_widget = QLabel(label_text)
@@ -962,11 +1382,10 @@ class PrintPathApp(QMainWindow):
                 min_val, max_val_def = defs.get("range", [0, 100]) 
                 
                 # Special handling for settings that might depend on total_layers (like num_snapshots or num_orbits)
-                if setting_key in ["num_snapshots", "num_orbits"] and self.gcode_info_full_data.get("total_layers") is not None:
-                    max_val_actual = max(1, self.gcode_info_full_data["total_layers"])
-                    max_val = min(max_val_actual, max(1, max_val_def)) 
-                    self._log_message(f"Setting max for '{setting_key}' to {max_val} (derived from total layers {self.gcode_info_full_data['total_layers']}).", "debug")
-                    # print(f"DEBUG: Setting max for '{setting_key}' to {max_val} (derived from total layers {self.gcode_info_full_data['total_layers']}).", file=sys.__stdout__) # Removed verbose debug
+                if setting_key in LAYER_DEPENDENT_SETTINGS and max_from_layers is not None:
+                    max_val = min(max_from_layers, max(1, max_val_def)) 
+                    self._log_message(f"Setting max for '{setting_key}' to {max_val} (derived from total layers {total_layers}).", "debug")
+                    # print(f"DEBUG: Setting max for '{setting_key}' to {max_val} (derived from total layers).", file=sys.__stdout__) # Removed verbose debug
                 else:
                     max_val = max_val_def 
                 
@@ -976,7 +1395,7 @@ class PrintPathApp(QMainWindow):
                 clamped_value = min(max(min_val, effective_value), max_val)
                 input_widget.setValue(clamped_value)
 
-                input_widget.valueChanged.connect(lambda value, key=setting_key: self._update_script_specific_setting(selected_script_name, key, value))
+                input_widget.valueChanged.connect(partial(self._update_script_specific_setting, selected_script_name, setting_key))
                 # print(f"DEBUG: Spinbox '{setting_key}' set to value: {clamped_value} (Range: {min_val}-{max_val})", file=sys.__stdout__) # Removed verbose debug
 
             elif setting_type == "doublespinbox":
@@ -986,7 +1405,7 @@ class PrintPathApp(QMainWindow):
                 input_widget.setSingleStep(defs.get("step", 0.1))
                 input_widget.setDecimals(defs.get("decimals", 2))
                 input_widget.setValue(value_from_settings if value_from_settings is not None else (default_from_defs if default_from_defs is not None else min_val))
-                input_widget.valueChanged.connect(lambda value, key=setting_key: self._update_script_specific_setting(selected_script_name, key, value))
+                input_widget.valueChanged.connect(partial(self._update_script_specific_setting, selected_script_name, setting_key))
                 # print(f"DEBUG: DoubleSpinbox '{setting_key}' set to value: {input_widget.value()} (Range: {min_val}-{max_val})", file=sys.__stdout__) # Removed verbose debug
 
             elif setting_type == "combobox":
@@ -994,7 +1413,7 @@ class PrintPathApp(QMainWindow):
                 items = defs.get("items", [])
                 input_widget.addItems(items)
                 input_widget.setCurrentText(value_from_settings if value_from_settings is not None else (default_from_defs if default_from_defs is not None else (items[0] if items else "")))
-                input_widget.currentTextChanged.connect(lambda text, key=setting_key: self._update_script_specific_setting(selected_script_name, key, text))
+                input_widget.currentTextChanged.connect(partial(self._update_script_specific_setting, selected_script_name, setting_key))
                 # print(f"DEBUG: Combobox '{setting_key}' set to text: '{input_widget.currentText()}' (Items: {items})", file=sys.__stdout__) # Removed verbose debug
 
             if input_widget:
@@ -1010,7 +1429,7 @@ class PrintPathApp(QMainWindow):
         # print(f"DEBUG: Exiting _update_settings_panel_visibility(). Current Settings: {self.current_settings}", file=sys.__stdout__) # Removed verbose debug
 
         self.current_settings["last_used_script"] = selected_script_name
-        save_settings(self.current_settings)
+        save_settings(self.current_settings) # Debounced write (see config.py)
 
 
     def _clear_dynamic_setting_widgets(self):
@@ -1021,28 +1440,12 @@ class PrintPathApp(QMainWindow):
         """
         # print(f"DEBUG: Clearing dynamic setting widgets for current script.", file=sys.__stdout__) # Removed verbose debug
 
-        while self.settings_form_layout.count() > len(self.global_setting_widgets):
-            found_and_removed = False
-            for setting_key, (label_widget, input_widget) in list(self.script_specific_setting_widgets.items()):
-                row_index = -1
-                for i in range(self.settings_form_layout.rowCount()):
-                    if self.settings_form_layout.itemAt(i, QFormLayout.LabelRole) and self.settings_form_layout.itemAt(i, QFormLayout.LabelRole).widget() is label_widget:
-                        row_index = i
-                        break
-                    if self.settings_form_layout.itemAt(i, QFormLayout.FieldRole) and self.settings_form_layout.itemAt(i, QFormLayout.FieldRole).widget() is input_widget:
-                        row_index = i
-                        break
-                
-                if row_index != -1:
-                    self.settings_form_layout.removeRow(row_index)
-                    del self.script_specific_setting_widgets[setting_key]
-                    found_and_removed = True
-                    # print(f"DEBUG: Removed dynamic widget row for '{setting_key}'.", file=sys.__stdout__) # Removed verbose debug
-                    break 
-            
-            if not found_and_removed:
-                # print("DEBUG: No more dynamic widgets found to clear or an issue occurred during removal.", file=sys.__stdout__) # Removed verbose debug
-                break
+        # QFormLayout.removeRow accepts a widget and removes (and deletes)
+        # the whole row containing it, so one call per tracked widget
+        # replaces the old quadratic rowCount()/itemAt() search loop.
+        for setting_key, (label_widget, input_widget) in self.script_specific_setting_widgets.items():
+            self.settings_form_layout.removeRow(label_widget)
+            # print(f"DEBUG: Removed dynamic widget row for '{setting_key}'.", file=sys.__stdout__) # Removed verbose debug
 
         self.script_specific_setting_widgets.clear()
         # print("DEBUG: script_specific_setting_widgets cleared.", file=sys.__stdout__) # Removed verbose debug
@@ -1073,16 +1476,19 @@ class PrintPathApp(QMainWindow):
         mode = self.script_combo.currentText() if self.script_combo.currentText() else DEFAULT_MODE
         
         self._set_ui_processing_state(True)
-        self._log_message(f"Processing '{os.path.basename(self.original_gcode_filepath)}' with '{mode}' script...", "info")
+        self._log_message(f"Processing '{self.original_gcode_basename}' with '{mode}' script...", "info")
         # print(f"DEBUG: Initiating G-code processing for '{os.path.basename(self.original_gcode_filepath)}' with '{mode}'.", file=sys.__stdout__) # Removed verbose debug
 
 
         save_settings(self.current_settings)
         # self._log_message("Current settings saved automatically.", "debug") # Removed verbose debug
 
-        combined_settings = {}
-        for key in self.global_default_settings.keys():
-            combined_settings[key] = self.current_settings.get(key, self.global_default_settings[key])
+        # Defaults first, then the saved values for those same keys — one
+        # C-level merge each instead of a per-key lookup loop.
+        combined_settings = dict(self.global_default_settings)
+        combined_settings.update(
+            (key, self.current_settings[key])
+            for key in self.global_default_settings if key in self.current_settings)
 
         script_specific_settings_for_mode = self.current_settings.get(mode, {})
         combined_settings.update(script_specific_settings_for_mode)
@@ -1123,21 +1529,28 @@ class PrintPathApp(QMainWindow):
             # --- FIX: Ensure Go! button resets even if same file is re-opened ---
             # If the same file is chosen, we still want to reset the UI state.
             if self.original_gcode_filepath == filepath:
-                self._log_message(f"File '{os.path.basename(filepath)}' is already loaded. Resetting 'Go!' button.", "info")
+                self._log_message(f"File '{self.original_gcode_basename}' is already loaded. Resetting 'Go!' button.", "info")
                 self.go_button.setText("Go!") # Reset button text
                 self.go_button.setEnabled(True) # Ensure it's enabled
-                self.gcode_viewer.set_processed_snapshot_points([]) # Clear processed snapshots on re-open
-                self._update_view_mode(self.view_mode_combo.currentText()) # Redraw viewer if needed
+                # Suspend viewer repaints while its state is re-applied so
+                # the re-open costs a single redraw at the end.
+                self.gcode_viewer.setUpdatesEnabled(False)
+                try:
+                    self.gcode_viewer.set_processed_snapshot_points([]) # Clear processed snapshots on re-open
+                    self._update_view_mode(self.view_mode_combo.currentText()) # Redraw viewer if needed
+                finally:
+                    self.gcode_viewer.setUpdatesEnabled(True)
                 self._on_settings_or_file_changed() # Signal that settings/file state has changed, enabling Go button
                 return # Exit, no re-parsing needed for same path
 
             self.original_gcode_filepath = filepath
-            
+            self.original_gcode_basename = os.path.basename(filepath)
+
             self.last_used_directory = os.path.dirname(filepath)
             self.current_settings["last_used_directory"] = self.last_used_directory
-            save_settings(self.current_settings) 
+            save_settings(self.current_settings)
 
-            filename_only = os.path.basename(filepath)
+            filename_only = self.original_gcode_basename
             if len(filename_only) > MAX_TITLE_FILENAME_LENGTH:
                 filename_only = "..." + filename_only[-(MAX_TITLE_FILENAME_LENGTH - 3):]
             self.setWindowTitle(f"PrintPath - {filename_only}")
@@ -1146,9 +1559,24 @@ class PrintPathApp(QMainWindow):
             # Clear processed snapshot points when a new file is opened
             self.gcode_viewer.set_processed_snapshot_points([])
 
+            # Parse-result cache: if this exact file (path, mtime, size)
+            # was parsed before and hasn't changed, apply the stored
+            # result directly instead of re-reading it in a thread.
+            cache_key = self._parse_cache_key(filepath)
+            cached = self._parse_cache.get(cache_key) if cache_key else None
+            if cached is not None:
+                self._parse_cache.move_to_end(cache_key)
+                self._log_message(f"Using cached parse for '{filename_only}'.", "info")
+                gcode_info, toolpath_data, layer_start_points, toolpath_bounds = cached
+                # _parsing_finished mutates the info dict (bbox overrides),
+                # so hand it a copy and keep the cached original pristine.
+                self._parsing_finished(dict(gcode_info), toolpath_data,
+                                       layer_start_points, dict(toolpath_bounds))
+                return
 
             # Start parsing in a new thread
             self._set_ui_for_parsing_state(True) # Show progress bar, disable UI
+            self._pending_parse_key = cache_key
             self.parse_thread = GCodeParseThread(self.original_gcode_filepath)
             self.parse_thread.finished.connect(self._parsing_finished)
             self.parse_thread.error.connect(self._parsing_error)
@@ -1159,11 +1587,33 @@ class PrintPathApp(QMainWindow):
             # print(f"INFO: Starting parsing thread for '{filename_only}'.", file=sys.__stdout__) # Removed verbose debug
 
 
+    def _parse_cache_key(self, filepath):
+        """
+        Builds the parse-cache key for a file: its absolute path plus
+        mtime and size, so any on-disk change invalidates the entry.
+        Returns None if the file can't be stat'ed.
+        """
+        try:
+            st = os.stat(filepath)
+        except OSError:
+            return None
+        return (os.path.abspath(filepath), st.st_mtime_ns, st.st_size)
+
     def _parsing_finished(self, gcode_info, toolpath_data, layer_start_points, toolpath_bounds): # MODIFIED: Added toolpath_bounds
         """
         Slot connected to GCodeParseThread's finished signal.
         Updates UI with parsed G-code info and toolpath, and layer start points.
         """
+        # Store the raw result (before the bbox overrides below mutate the
+        # info dict) so re-opening this unchanged file skips the thread.
+        if self._pending_parse_key is not None:
+            self._parse_cache[self._pending_parse_key] = (
+                dict(gcode_info), toolpath_data, layer_start_points, dict(toolpath_bounds))
+            self._parse_cache.move_to_end(self._pending_parse_key)
+            while len(self._parse_cache) > PARSE_CACHE_MAX_ENTRIES:
+                self._parse_cache.popitem(last=False)
+            self._pending_parse_key = None
+
         self._set_ui_for_parsing_state(False) # Hide progress bar, enable UI
         # print("DEBUG: G-code parsing finished. Updating UI.", file=sys.__stdout__) # Removed verbose debug
 
@@ -1210,62 +1660,69 @@ class PrintPathApp(QMainWindow):
         self._log_message(f"Detected toolpath min Z for model: {self.gcode_info_full_data['min_z_path']:.1f}", "debug")
 
 
-        # --- Update bed dimensions and max_z for viewer ---
-        self.gcode_bed_dimensions = self.gcode_info_full_data.get("bed_dimensions")
-        detected_max_z = self.gcode_info_full_data.get("max_z", 250.0) # Default to 250 if not detected
+        # Suspend viewer repaints while bed dimensions, toolpath, marker
+        # sets and view mode are re-applied: the whole update then costs
+        # one redraw instead of one per setter.
+        self.gcode_viewer.setUpdatesEnabled(False)
+        try:
+            # --- Update bed dimensions and max_z for viewer ---
+            self.gcode_bed_dimensions = self.gcode_info_full_data.get("bed_dimensions")
+            detected_max_z = self.gcode_info_full_data.get("max_z", 250.0) # Default to 250 if not detected
         
-        if self.gcode_bed_dimensions:
-            self._log_message(f"Detected bed dimensions: {self.gcode_bed_dimensions['x']:.1f}x{self.gcode_bed_dimensions['y']:.1f}mm, Max Z: {detected_max_z:.1f}mm", "debug")
-            # print(f"DEBUG: Detected bed dimensions: {self.gcode_bed_dimensions['x']:.1f}x{self.gcode_bed_dimensions['y']:.1f}mm, Max Z: {detected_max_z:.1f}mm", file=sys.__stdout__) # Removed verbose debug
-            # Ensure bed dimensions are valid numbers before passing to viewer
-            bed_x = max(1.0, self.gcode_bed_dimensions.get('x', 220.0))
-            bed_y = max(1.0, self.gcode_bed_dimensions.get('y', 220.0))
-            self.gcode_viewer.set_bed_dimensions(bed_x, bed_y, detected_max_z)
-        else:
-            self._log_message("Bed dimensions not detected from file. Viewer will use default 220x220mm.", "warning")
-            # print("WARNING: Bed dimensions not detected from file. Using default 220x220mm.", file=sys.__stdout__) # Removed verbose debug
-            self.gcode_bed_dimensions = {"x": DEFAULT_BED_X, "y": DEFAULT_BED_Y} # Set fallback in main app as well
-            self.gcode_viewer.set_bed_dimensions(DEFAULT_BED_X, DEFAULT_BED_Y, detected_max_z)
-
-        # --- Update firmware flavor ---
-        detected_flavor = self.gcode_info_full_data.get("gcode_flavor")
-        if detected_flavor:
-            self._log_message(f"Detected G-code flavor: {detected_flavor}", "debug")
-            # print(f"DEBUG: Detected G-code flavor: {detected_flavor}", file=sys.__stdout__) # Removed verbose debug
-            self.firmware_input.blockSignals(True)
-            self.firmware_input.setCurrentText(detected_flavor)
-            self.firmware_input.blockSignals(False)
-            self._update_setting("firmware", detected_flavor) 
-        else:
-            self._log_message("G-code flavor not detected from file. Using current firmware setting.", "debug")
-            # print("DEBUG: G-code flavor not detected from file. Using current firmware setting.", file=sys.__stdout__) # Removed verbose debug
-
-        # --- Update toolpath data ---
-        self.gcode_toolpath_data = toolpath_data # Now list of (QPointF(x,y), z_value)
-        # print(f"DEBUG (main.py): About to pass {len(self.gcode_toolpath_data)} points to GCodeViewer.set_gcode_data().", file=sys.__stdout__) # Removed verbose debug
-        # if self.gcode_toolpath_data and len(self.gcode_toolpath_data) > 0: # Removed verbose debug
-            # print(f"DEBUG (main.py): First point to viewer: ({self.gcode_toolpath_data[0][0].x():.1f}, {self.gcode_toolpath_data[0][0].y():.1f}, Z={self.gcode_toolpath_data[0][1]:.1f})", file=sys.__stdout__) # Removed verbose debug
-        self._log_message(f"Passing {len(self.gcode_toolpath_data)} points to GCodeViewer.set_gcode_data().", "debug")
-        self.gcode_viewer.set_gcode_data(self.gcode_toolpath_data) # Pass the new (XY, Z) tuples
+            if self.gcode_bed_dimensions:
+                self._log_message(f"Detected bed dimensions: {self.gcode_bed_dimensions['x']:.1f}x{self.gcode_bed_dimensions['y']:.1f}mm, Max Z: {detected_max_z:.1f}mm", "debug")
+                # print(f"DEBUG: Detected bed dimensions: {self.gcode_bed_dimensions['x']:.1f}x{self.gcode_bed_dimensions['y']:.1f}mm, Max Z: {detected_max_z:.1f}mm", file=sys.__stdout__) # Removed verbose debug
+                # Ensure bed dimensions are valid numbers before passing to viewer
+                bed_x = max(1.0, self.gcode_bed_dimensions.get('x', 220.0))
+                bed_y = max(1.0, self.gcode_bed_dimensions.get('y', 220.0))
+                self.gcode_viewer.set_bed_dimensions(bed_x, bed_y, detected_max_z)
+            else:
+                self._log_message("Bed dimensions not detected from file. Viewer will use default 220x220mm.", "warning")
+                # print("WARNING: Bed dimensions not detected from file. Using default 220x220mm.", file=sys.__stdout__) # Removed verbose debug
+                self.gcode_bed_dimensions = {"x": DEFAULT_BED_X, "y": DEFAULT_BED_Y} # Set fallback in main app as well
+                self.gcode_viewer.set_bed_dimensions(DEFAULT_BED_X, DEFAULT_BED_Y, detected_max_z)
+
+            # --- Update firmware flavor ---
+            detected_flavor = self.gcode_info_full_data.get("gcode_flavor")
+            if detected_flavor:
+                self._log_message(f"Detected G-code flavor: {detected_flavor}", "debug")
+                # print(f"DEBUG: Detected G-code flavor: {detected_flavor}", file=sys.__stdout__) # Removed verbose debug
+                self.firmware_input.blockSignals(True)
+                self.firmware_input.setCurrentText(detected_flavor)
+                self.firmware_input.blockSignals(False)
+                self._update_setting("firmware", detected_flavor) 
+            else:
+                self._log_message("G-code flavor not detected from file. Using current firmware setting.", "debug")
+                # print("DEBUG: G-code flavor not detected from file. Using current firmware setting.", file=sys.__stdout__) # Removed verbose debug
+
+            # --- Update toolpath data ---
+            self.gcode_toolpath_data = toolpath_data # (N, 3) float32 ndarray of x, y, z rows
+            # print(f"DEBUG (main.py): About to pass {len(self.gcode_toolpath_data)} points to GCodeViewer.set_gcode_data().", file=sys.__stdout__) # Removed verbose debug
+            # if self.gcode_toolpath_data and len(self.gcode_toolpath_data) > 0: # Removed verbose debug
+                # print(f"DEBUG (main.py): First point to viewer: ({self.gcode_toolpath_data[0][0].x():.1f}, {self.gcode_toolpath_data[0][0].y():.1f}, Z={self.gcode_toolpath_data[0][1]:.1f})", file=sys.__stdout__) # Removed verbose debug
+            self._log_message(f"Passing {len(self.gcode_toolpath_data)} points to GCodeViewer.set_gcode_data().", "debug")
+            self.gcode_viewer.set_gcode_data(self.gcode_toolpath_data) # Pass the (N, 3) array
         
-        # --- Update layer start points (for pre-processing preview) ---
-        self.gcode_layer_start_points = layer_start_points
-        self._log_message(f"Passing {len(self.gcode_layer_start_points)} layer start points to GCodeViewer.set_layer_start_points().", "debug")
-        self.gcode_viewer.set_layer_start_points(self.gcode_layer_start_points)
+            # --- Update layer start points (for pre-processing preview) ---
+            self.gcode_layer_start_points = layer_start_points
+            self._log_message(f"Passing {len(self.gcode_layer_start_points)} layer start points to GCodeViewer.set_layer_start_points().", "debug")
+            self.gcode_viewer.set_layer_start_points(self.gcode_layer_start_points)
 
-        # Clear any processed snapshot points that might be lingering from a previous process
-        self.gcode_viewer.set_processed_snapshot_points([])
+            # Clear any processed snapshot points that might be lingering from a previous process
+            self.gcode_viewer.set_processed_snapshot_points([])
 
 
-        # Apply the currently selected view mode
-        self._update_view_mode(self.view_mode_combo.currentText())
+            # Apply the currently selected view mode
+            self._update_view_mode(self.view_mode_combo.currentText())
+        finally:
+            self.gcode_viewer.setUpdatesEnabled(True)
 
         # Update script-specific settings visibility and ranges (especially for num_snapshots)
         # This is important to call AFTER gcode_info_full_data is set
         self._update_settings_panel_visibility() 
         
         self.go_button.setEnabled(True) 
-        self._log_message(f"File '{os.path.basename(self.original_gcode_filepath)}' loaded for preview. Click 'Go!' to process.", "info")
+        self._log_message(f"File '{self.original_gcode_basename}' loaded for preview. Click 'Go!' to process.", "info")
         # print(f"INFO: File '{os.path.basename(self.original_gcode_filepath)}' loaded successfully for preview.", file=sys.__stdout__) # Removed verbose debug
 
 
@@ -1274,8 +1731,10 @@ class PrintPathApp(QMainWindow):
         Slot connected to GCodeParseThread's error signal.
         Logs the error and re-enables UI.
         """
+        self._pending_parse_key = None # Failed parses are never cached
         self._set_ui_for_parsing_state(False)
         self.original_gcode_filepath = None
+        self.original_gcode_basename = None
         self.gcode_toolpath_data = [] # Set to empty list on error
         self.gcode_layer_start_points = [] # Clear layer start points on error
         self.gcode_viewer.set_processed_snapshot_points([]) # Clear processed snapshot points on error
@@ -1294,28 +1753,34 @@ class PrintPathApp(QMainWindow):
         Manages UI state specifically during G-code file parsing for preview.
         """
         # print(f"DEBUG: Setting UI for parsing state: is_parsing={is_parsing}", file=sys.__stdout__) # Removed verbose debug
-        self.script_combo.setEnabled(not is_parsing)
-        self.settings_group_box.setEnabled(not is_parsing)
-        self.go_button.setEnabled(not is_parsing)
-        self.clear_log_button.setEnabled(not is_parsing) 
-        self.view_mode_combo.setEnabled(not is_parsing) 
-        
-        for action in self.menuBar().actions():
-            if hasattr(action, 'menu') and action.menu(): 
-                action.menu().setEnabled(not is_parsing)
-            else: 
-                if action != self.debug_mode_action: 
-                    action.setEnabled(not is_parsing)
-
-        if is_parsing:
-            self.progress_bar.show()
-        else:
-            self.progress_bar.hide()
-            if self.debug_mode_action:
-                self.debug_mode_action.setEnabled(True)
+        # Suspend repaints while every control's enabled state flips, so
+        # the whole transition costs one repaint instead of one per widget.
+        self.setUpdatesEnabled(False)
+        try:
+            self.script_combo.setEnabled(not is_parsing)
+            self.settings_group_box.setEnabled(not is_parsing)
+            self.go_button.setEnabled(not is_parsing)
+            self.clear_log_button.setEnabled(not is_parsing)
+            self.view_mode_combo.setEnabled(not is_parsing)
+
+            for action in self.menuBar().actions():
+                if hasattr(action, 'menu') and action.menu():
+                    action.menu().setEnabled(not is_parsing)
+                else:
+                    if action != self.debug_mode_action:
+                        action.setEnabled(not is_parsing)
 
+            if is_parsing:
+                self.progress_bar.show()
+            else:
+                self.progress_bar.hide()
+                if self.debug_mode_action:
+                    self.debug_mode_action.setEnabled(True)
+        finally:
+            self.setUpdatesEnabled(True)
 
-    def _processing_finished(self, original_filepath, processed_content, mode, snapshot_points):
+
+    def _processing_finished(self, original_filepath, processed_content, mode, snapshot_points, snapshot_count):
         """
         Slot connected to the GCodeProcessorThread's finished signal.
         Updates the GUI with the processed content, saves it, and changes button behavior.
@@ -1330,21 +1795,26 @@ class PrintPathApp(QMainWindow):
             self.save_as_action.setEnabled(True)
             self._log_message(f"G-code processing complete for '{os.path.basename(original_filepath)}'.", "info")
             
-            snapshot_count = processed_content.count("TIMELAPSE_TAKE_FRAME")
+            # snapshot_count was tallied by the worker thread while it
+            # still had the buffer hot; no GUI-thread scan needed.
             self._log_message(f"Detected {snapshot_count} TIMELAPSE_TAKE_FRAME commands in the processed G-code.", "info")
             # print(f"INFO: Detected {snapshot_count} TIMELAPSE_TAKE_FRAME commands.", file=sys.__stdout__) # Removed verbose debug
 
-            self.output_filepath = self._auto_save_processed_gcode(original_filepath, mode)
-            
             self.gcode_viewer.set_processed_snapshot_points(snapshot_points)
             self._log_message(f"Viewer updated with {len(snapshot_points)} processed snapshot points.", "debug")
             # print(f"DEBUG: Viewer updated with {len(snapshot_points)} processed snapshot points.", file=sys.__stdout__) # Removed verbose debug
 
-
-            if self.output_filepath:
-                self.go_button.setText(f"Open '{os.path.basename(self.output_filepath)}'")
-                self.go_button.setEnabled(True)
-                # print(f"DEBUG: Auto-save successful. Go button text updated to 'Open {os.path.basename(self.output_filepath)}'.", file=sys.__stdout__) # Removed verbose debug
+            # Auto-save on a worker thread: the write of a potentially
+            # very large output would otherwise freeze the event loop.
+            self.output_filepath = None
+            out_path = self._derive_output_filepath(original_filepath, mode)
+            if out_path:
+                self.go_button.setText("Saving...")
+                self.go_button.setEnabled(False)
+                self.save_thread = GCodeSaveThread(out_path, processed_content)
+                self.save_thread.finished.connect(self._auto_save_finished)
+                self.save_thread.error.connect(self._auto_save_error)
+                self.save_thread.start()
             else:
                 self._log_message("Automatic save failed, 'Open Processed File' button will not be available.", "warning")
                 # print("WARNING: Automatic save failed. Open button disabled.", file=sys.__stdout__) # Removed verbose debug
@@ -1385,47 +1855,54 @@ class PrintPathApp(QMainWindow):
         based on whether processing is ongoing (for script processing).
         """
         # print(f"DEBUG: Setting UI for processing state: is_processing={is_processing}", file=sys.__stdout__) # Removed verbose debug
-        self.script_combo.setEnabled(not is_processing)
-        self.settings_group_box.setEnabled(not is_processing)
-        self.clear_log_button.setEnabled(not is_processing)
-        self.view_mode_combo.setEnabled(not is_processing) 
-
-        for action in self.menuBar().actions():
-            if hasattr(action, 'menu') and action.menu(): 
-                action.menu().setEnabled(not is_processing)
-            else: 
-                if action != self.debug_mode_action:
-                    action.setEnabled(not is_processing) 
-
-        if not is_processing and self.processed_gcode_content:
-            self.save_action.setEnabled(True)
-            self.save_as_action.setEnabled(True)
-        else:
-            self.save_action.setEnabled(False)
-            self.save_as_action.setEnabled(False)
-
-
-        for setting_key, (label_widget, input_widget) in self.global_setting_widgets.items():
-            is_visible_by_script = label_widget.isVisible() 
-            input_widget.setEnabled(not is_processing and is_visible_by_script)
-            # print(f"DEBUG: Global setting widget '{setting_key}' enabled: {input_widget.isEnabled()} (visible by script: {is_visible_by_script})", file=sys.__stdout__) # Removed verbose debug
-
-
-        for setting_key, (label_widget, input_widget) in self.script_specific_setting_widgets.items():
-            input_widget.setEnabled(not is_processing)
-            # print(f"DEBUG: Script specific setting widget '{setting_key}' enabled: {input_widget.isEnabled()}", file=sys.__stdout__) # Removed verbose debug
+        # Suspend repaints while every control's enabled state flips, so
+        # the whole transition costs one repaint instead of one per widget.
+        self.setUpdatesEnabled(False)
+        try:
+            self.script_combo.setEnabled(not is_processing)
+            self.settings_group_box.setEnabled(not is_processing)
+            self.clear_log_button.setEnabled(not is_processing)
+            self.view_mode_combo.setEnabled(not is_processing)
+
+            for action in self.menuBar().actions():
+                if hasattr(action, 'menu') and action.menu():
+                    action.menu().setEnabled(not is_processing)
+                else:
+                    if action != self.debug_mode_action:
+                        action.setEnabled(not is_processing)
 
+            if not is_processing and self.processed_gcode_content:
+                self.save_action.setEnabled(True)
+                self.save_as_action.setEnabled(True)
+            else:
+                self.save_action.setEnabled(False)
+                self.save_as_action.setEnabled(False)
 
-        if is_processing:
-            self.go_button.setEnabled(False)
-            self.progress_bar.show()
-            # print("DEBUG: Processing active. Go button disabled, progress bar shown.", file=sys.__stdout__) # Removed verbose debug
-        else:
-            self.progress_bar.hide()
-            self.go_button.setEnabled(self.original_gcode_filepath is not None)
-            if self.debug_mode_action:
-                self.debug_mode_action.setEnabled(True)
-            # print(f"DEBUG: Processing inactive. Go button enabled: {self.go_button.isEnabled()} (File loaded: {self.original_gcode_filepath is not None}). Progress bar hidden.", file=sys.__stdout__) # Removed verbose debug
+            # While processing, disabling the settings group box above
+            # already greys out every child widget via Qt's parent-state
+            # inheritance, so the per-widget loops only need to run on the
+            # way back, to restore each widget's own enabled flag (which
+            # depends on script visibility).
+            if not is_processing:
+                for setting_key, (label_widget, input_widget) in self.global_setting_widgets.items():
+                    is_visible_by_script = label_widget.isVisible()
+                    input_widget.setEnabled(is_visible_by_script)
+
+                for setting_key, (label_widget, input_widget) in self.script_specific_setting_widgets.items():
+                    input_widget.setEnabled(True)
+
+            if is_processing:
+                self.go_button.setEnabled(False)
+                self.progress_bar.show()
+                # print("DEBUG: Processing active. Go button disabled, progress bar shown.", file=sys.__stdout__) # Removed verbose debug
+            else:
+                self.progress_bar.hide()
+                self.go_button.setEnabled(self.original_gcode_filepath is not None)
+                if self.debug_mode_action:
+                    self.debug_mode_action.setEnabled(True)
+                # print(f"DEBUG: Processing inactive. Go button enabled: {self.go_button.isEnabled()} (File loaded: {self.original_gcode_filepath is not None}). Progress bar hidden.", file=sys.__stdout__) # Removed verbose debug
+        finally:
+            self.setUpdatesEnabled(True)
 
     
     def _on_settings_or_file_changed(self):
@@ -1458,7 +1935,9 @@ class PrintPathApp(QMainWindow):
         save_settings(self.current_settings)
         # self._log_message(f"Preview view mode set to: '{mode}'.", "debug") # Removed verbose debug
 
-        if self.original_gcode_filepath and self.gcode_toolpath_data:
+        # Explicit None/len check: toolpath data is an ndarray, whose
+        # truth value is ambiguous.
+        if self.original_gcode_filepath and self.gcode_toolpath_data is not None and len(self.gcode_toolpath_data):
             # print("DEBUG: Re-drawing GCodeViewer with current data due to view mode change.", file=sys.__stdout__) # Removed verbose debug
             detected_max_z = self.gcode_info_full_data.get("max_z", 250.0)
             self.gcode_viewer.set_bed_dimensions(self.gcode_bed_dimensions['x'], self.gcode_bed_dimensions['y'], detected_max_z)
@@ -1468,30 +1947,57 @@ class PrintPathApp(QMainWindow):
             # print("DEBUG: No G-code data to re-draw for viewer after view mode change.", file=sys.__stdout__) # Removed verbose debug
 
 
+    def _derive_output_filepath(self, original_filepath, mode):
+        """
+        Derives the auto-save output path (<name>_<mode><ext> next to the
+        original file). Returns None when no original path is known.
+        """
+        if not original_filepath:
+            return None
+        base_dir = os.path.dirname(original_filepath)
+        base_name, ext = os.path.splitext(os.path.basename(original_filepath))
+        mode_suffix = mode if mode else DEFAULT_MODE
+        return os.path.join(base_dir, f"{base_name}_{mode_suffix}{ext}")
+
+    def _auto_save_finished(self, filepath):
+        """
+        Slot for GCodeSaveThread.finished: records the output path and
+        turns the Go button into the 'Open ...' action.
+        """
+        self.output_filepath = filepath
+        self._log_message(f"Processed G-code automatically saved to: {filepath}", "info")
+        self.go_button.setText(f"Open '{os.path.basename(filepath)}'")
+        self.go_button.setEnabled(True)
+
+    def _auto_save_error(self, filepath, message):
+        """
+        Slot for GCodeSaveThread.error: logs the failure and restores the
+        Go button.
+        """
+        self.output_filepath = None
+        self._log_message(f"Error auto-saving G-code to {filepath}: {message}", "error")
+        print(f"ERROR: Error auto-saving G-code to {filepath}: {message}", file=sys.__stdout__)
+        self.go_button.setText("Go!")
+        self.go_button.setEnabled(True)
+
     def _auto_save_processed_gcode(self, original_filepath, mode):
         """
-        Automatically saves the currently processed G-code content to a derived filename
-        in the same directory as the original file, without a file dialog.
+        Synchronously saves the currently processed G-code content to the
+        derived filename (used by the explicit Save menu action; the
+        post-processing auto-save runs on GCodeSaveThread instead).
         Returns the path of the saved file or None on failure.
         """
         # print(f"DEBUG: Attempting auto-save for processed G-code. Original: {original_filepath}, Mode: {mode}", file=sys.__stdout__) # Removed verbose debug
         if self.processed_gcode_content is None:
             # self._log_message("No G-code has been processed yet to save automatically.", "debug") # Removed verbose debug
             return None
-        if not original_filepath:
+        filepath = self._derive_output_filepath(original_filepath, mode)
+        if filepath is None:
             # self._log_message("Cannot auto-save: Original G-code file path is unknown.", "debug") # Removed verbose debug
             return None
 
-        base_dir = os.path.dirname(original_filepath)
-        base_name, ext = os.path.splitext(os.path.basename(original_filepath))
-        mode_suffix = mode if mode else DEFAULT_MODE
-        
-        output_filename = f"{base_name}_{mode_suffix}{ext}"
-        filepath = os.path.join(base_dir, output_filename)
-
         try:
-            with open(filepath, "w") as f:
-                f.write(self.processed_gcode_content)
+            _write_gcode_file(filepath, self.processed_gcode_content)
             self._log_message(f"Processed G-code automatically saved to: {filepath}", "info")
             # print(f"INFO: Processed G-code automatically saved to: {filepath}", file=sys.__stdout__) # Removed verbose debug
             return filepath
@@ -1530,7 +2036,7 @@ class PrintPathApp(QMainWindow):
 
         default_filename = "processed_output.gcode"
         if self.original_gcode_filepath:
-            base, ext = os.path.splitext(os.path.basename(self.original_gcode_filepath))
+            base, ext = os.path.splitext(self.original_gcode_basename)
             mode_suffix = self.script_combo.currentText() if self.script_combo.currentText() else DEFAULT_MODE
             default_filename = f"{base}_{mode_suffix}{ext}"
 
@@ -1540,8 +2046,7 @@ class PrintPathApp(QMainWindow):
 
         if filepath:
             try:
-                with open(filepath, "w") as f:
-                    f.write(self.processed_gcode_content)
+                _write_gcode_file(filepath, self.processed_gcode_content)
                 self._log_message(f"Processed G-code saved to: {filepath}", "info")
                 # print(f"INFO: Processed G-code saved to: {filepath}", file=sys.__stdout__) # Removed verbose debug
                 self.save_action.setEnabled(False)
@@ -1616,15 +2121,53 @@ if __name__ == "__main__":
         
         try:
             run_func = load_script(DEFAULT_MODE)
-            with open(filepath, "r") as f:
-                gcode_lines = f.readlines()
-            
-            sys.stdout = StreamRedirect(lambda msg, type: ORIGINAL_STDOUT.write(f"[{type.upper()}] {msg}\n"), "debug", ORIGINAL_STDOUT, ORIGINAL_STDERR)
+
+            # Only imported here: the GUI path never needs them.
+            import queue
+            from concurrent.futures import ThreadPoolExecutor
+            from types import SimpleNamespace
+
+            # StreamRedirect expects a pyqtSignal-like object and calls
+            # .emit() on it; a plain lambda here crashed the CLI path.
+            # StreamRedirect already echoes to ORIGINAL_STDOUT itself, so
+            # the signal side can be a no-op shim.
+            cli_log_signal = SimpleNamespace(emit=lambda msg, msg_type: None)
+            sys.stdout = StreamRedirect(cli_log_signal, "debug", ORIGINAL_STDOUT, ORIGINAL_STDERR)
 
             temp_parse_thread = GCodeParseThread(filepath)
-            
-            dummy_gcode_info = temp_parse_thread._parse_gcode_info_main_app(gcode_lines)
-            dummy_toolpath_data, dummy_layer_start_points, dummy_toolpath_bounds = temp_parse_thread._parse_gcode_toolpath(gcode_lines) 
+
+            # Overlap the file read with the parse pass instead of doing
+            # readlines() first and parsing second. The main thread reads
+            # blocks of lines and both keeps them (run_func needs the full
+            # list) and pushes them through a bounded queue to the parser
+            # running on a pool worker, so disk I/O and parsing proceed
+            # concurrently.
+            gcode_lines = []
+            line_queue = queue.Queue(maxsize=CLI_READ_QUEUE_DEPTH)
+
+            def _queued_line_blocks():
+                """Yields lines from the read queue until the None sentinel."""
+                while True:
+                    block = line_queue.get()
+                    if block is None:
+                        return
+                    for line in block:
+                        yield line
+
+            with ThreadPoolExecutor(max_workers=1) as cli_parse_pool:
+                parse_future = cli_parse_pool.submit(temp_parse_thread._parse_gcode, _queued_line_blocks())
+                try:
+                    with open(filepath, "r") as f:
+                        while True:
+                            block = f.readlines(CLI_READ_BLOCK_BYTES)
+                            if not block:
+                                break
+                            gcode_lines.extend(block)
+                            line_queue.put(block)
+                finally:
+                    # Always unblock the parser, even if the read fails partway.
+                    line_queue.put(None)
+                dummy_gcode_info, dummy_toolpath_data, dummy_layer_start_points, dummy_toolpath_bounds = parse_future.result()
 
             cli_settings.update(dummy_gcode_info)
             cli_settings["toolpath_data"] = dummy_toolpath_data